@@ -72,14 +72,15 @@ impl CodeChunker {
                 section_tags.extend(boundary_tags.iter().cloned());
             }
 
-            if estimate_tokens(&section_content) <= max_tokens {
+            let section_tokens = estimate_tokens(&section_content);
+            if section_tokens <= max_tokens {
                 chunks.push(Chunk {
                     id: stable_hash(&section_content, &file_info.relative_path, start + 1, end),
                     path: file_info.relative_path.clone(),
                     language: file_info.language.clone(),
                     start_line: start + 1,
                     end_line: end,
-                    token_estimate: estimate_tokens(&section_content),
+                    token_estimate: section_tokens,
                     content: section_content,
                     priority: file_info.priority,
                     tags: section_tags,
@@ -107,13 +108,9 @@ impl CodeChunker {
     }
 }
 
-fn chunk_with_tree_sitter(
-    file_info: &FileInfo,
-    content: &str,
-    max_tokens: usize,
-    overlap_tokens: usize,
-) -> Option<Vec<Chunk>> {
-    let (language, definition_kinds): (Language, &[&str]) = match file_info.language.as_str() {
+/// Grammar and top-level definition node kinds for a tree-sitter supported language.
+fn tree_sitter_language(language: &str) -> Option<(Language, &'static [&'static str])> {
+    let entry: (Language, &'static [&'static str]) = match language {
         "python" => (
             tree_sitter_python::LANGUAGE.into(),
             &["function_definition", "class_definition", "decorated_definition"],
@@ -154,6 +151,16 @@ fn chunk_with_tree_sitter(
         ),
         _ => return None,
     };
+    Some(entry)
+}
+
+fn chunk_with_tree_sitter(
+    file_info: &FileInfo,
+    content: &str,
+    max_tokens: usize,
+    overlap_tokens: usize,
+) -> Option<Vec<Chunk>> {
+    let (language, definition_kinds) = tree_sitter_language(file_info.language.as_str())?;
 
     let mut parser = Parser::new();
     parser.set_language(&language).ok()?;
@@ -232,14 +239,15 @@ fn chunk_by_boundaries(
             section_tags.extend(boundary_tags.iter().cloned());
         }
 
-        if estimate_tokens(&section_content) <= max_tokens {
+        let section_tokens = estimate_tokens(&section_content);
+        if section_tokens <= max_tokens {
             chunks.push(Chunk {
                 id: stable_hash(&section_content, &file_info.relative_path, start + 1, end),
                 path: file_info.relative_path.clone(),
                 language: file_info.language.clone(),
                 start_line: start + 1,
                 end_line: end,
-                token_estimate: estimate_tokens(&section_content),
+                token_estimate: section_tokens,
                 content: section_content,
                 priority: file_info.priority,
                 tags: section_tags,
@@ -474,19 +482,22 @@ fn clean_symbol_name(raw: &str) -> Option<String> {
 
 #[cfg(test)]
 mod tests {
-    use super::CodeChunker;
-    use crate::domain::FileInfo;
+    use super::{supported_tree_sitter_languages, tree_sitter_language, CodeChunker};
+    use crate::domain::{Chunk, FileInfo};
     use std::collections::BTreeSet;
     use std::path::PathBuf;
 
-    #[test]
-    fn code_chunker_splits_at_definitions() {
+    /// Chunk `content` as the file `relative_path` with the budget the tests below share.
+    fn chunk_sample(relative_path: &str, language: &str, content: &str) -> Vec<Chunk> {
+        let path = PathBuf::from("/tmp").join(relative_path);
+        let extension =
+            path.extension().map(|e| format!(".{}", e.to_string_lossy())).unwrap_or_default();
         let info = FileInfo {
-            path: PathBuf::from("/tmp/main.py"),
-            relative_path: "main.py".to_string(),
+            path,
+            relative_path: relative_path.to_string(),
             size_bytes: 0,
-            extension: ".py".to_string(),
-            language: "python".to_string(),
+            extension,
+            language: language.to_string(),
             id: "x".to_string(),
             priority: 0.8,
             token_estimate: 0,
@@ -495,9 +506,13 @@ mod tests {
             is_config: false,
             is_doc: false,
         };
+        CodeChunker::new().chunk(&info, content, 20, 0)
+    }
 
+    #[test]
+    fn code_chunker_splits_at_definitions() {
         let content = "def a():\n    pass\n\ndef b():\n    pass\n\ndef c():\n    pass\n";
-        let chunks = CodeChunker::new().chunk(&info, content, 20, 0);
+        let chunks = chunk_sample("main.py", "python", content);
         assert!(!chunks.is_empty());
         assert!(chunks.len() >= 2);
         assert!(chunks[0].start_line >= 1);
@@ -506,23 +521,8 @@ mod tests {
 
     #[test]
     fn code_chunker_supports_rust_tree_sitter() {
-        let info = FileInfo {
-            path: PathBuf::from("/tmp/main.rs"),
-            relative_path: "main.rs".to_string(),
-            size_bytes: 0,
-            extension: ".rs".to_string(),
-            language: "rust".to_string(),
-            id: "x".to_string(),
-            priority: 0.8,
-            token_estimate: 0,
-            tags: BTreeSet::new(),
-            is_readme: false,
-            is_config: false,
-            is_doc: false,
-        };
-
         let content = "struct S;\nfn a() {}\nimpl S { fn b(&self) {} }\nfn c() {}\n";
-        let chunks = CodeChunker::new().chunk(&info, content, 20, 0);
+        let chunks = chunk_sample("main.rs", "rust", content);
         assert!(!chunks.is_empty());
         assert!(chunks.len() >= 2);
         assert!(chunks.iter().any(|c| c.tags.iter().any(|t| t.starts_with("def:a"))));
@@ -531,25 +531,24 @@ mod tests {
 
     #[test]
     fn code_chunker_supports_go_tree_sitter() {
-        let info = FileInfo {
-            path: PathBuf::from("/tmp/main.go"),
-            relative_path: "main.go".to_string(),
-            size_bytes: 0,
-            extension: ".go".to_string(),
-            language: "go".to_string(),
-            id: "x".to_string(),
-            priority: 0.8,
-            token_estimate: 0,
-            tags: BTreeSet::new(),
-            is_readme: false,
-            is_config: false,
-            is_doc: false,
-        };
-
         let content = "package main\n\nfunc a() {}\n\nfunc b() {}\n\nfunc main() {}\n";
-        let chunks = CodeChunker::new().chunk(&info, content, 20, 0);
+        let chunks = chunk_sample("main.go", "go", content);
         assert!(!chunks.is_empty());
         assert!(chunks.len() >= 2);
         assert!(chunks.iter().any(|c| c.tags.contains("def:a")));
     }
+
+    /// A grammar built against an incompatible tree-sitter ABI fails `set_language`, and
+    /// `CodeChunker` would then silently fall back to boundary heuristics.
+    #[test]
+    fn tree_sitter_grammars_load_for_supported_languages() {
+        for language in supported_tree_sitter_languages() {
+            let (grammar, _) = tree_sitter_language(language).expect("grammar compiled in");
+            assert!(
+                tree_sitter::Parser::new().set_language(&grammar).is_ok(),
+                "{language} grammar should load"
+            );
+        }
+        assert!(tree_sitter_language("cobol").is_none());
+    }
 }
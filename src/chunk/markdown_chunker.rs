@@ -60,7 +60,8 @@ impl MarkdownChunker {
 
         for (start, end, heading) in sections {
             let section_content = lines[start..end].join("");
-            if estimate_tokens(&section_content) <= max_tokens {
+            let section_tokens = estimate_tokens(&section_content);
+            if section_tokens <= max_tokens {
                 let mut tags = file_info.tags.clone();
                 if let Some(ref h) = heading {
                     if !h.is_empty() {
@@ -73,7 +74,7 @@ impl MarkdownChunker {
                     language: file_info.language.clone(),
                     start_line: start + 1,
                     end_line: end,
-                    token_estimate: estimate_tokens(&section_content),
+                    token_estimate: section_tokens,
                     content: section_content,
                     priority: file_info.priority,
                     tags,
@@ -52,7 +52,10 @@ pub fn chunk_content(
         return Ok(chunks);
     }
 
-    let line_count = content.lines().count().max(1);
+    // Same count as `content.lines().count()`: one per newline, plus an unterminated last line
+    let newlines = content.bytes().filter(|&b| b == b'\n').count();
+    let line_count =
+        (newlines + usize::from(!content.is_empty() && !content.ends_with('\n'))).max(1);
     let token_estimate = estimate_tokens(content);
     let id = stable_hash(content, &file_info.relative_path, 1, line_count);
 
@@ -149,3 +152,176 @@ fn chunker_for_language(language: &str) -> ChunkerKind {
         _ => ChunkerKind::Line,
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use once_cell::sync::Lazy;
+    use std::collections::BTreeSet;
+    use std::path::PathBuf;
+
+    /// Shared 100-line corpus for the line-chunker tests, built once per test binary.
+    static LINES_100: Lazy<String> =
+        Lazy::new(|| (0..100).map(|i| format!("Line {i}")).collect::<Vec<_>>().join("\n"));
+
+    const PY_SAMPLE: &str = "def function_one():\n    return 1\n\n\ndef function_two():\n    return 2\n\n\nclass MyClass:\n    def method(self):\n        return 3\n";
+
+    const JS_SAMPLE: &str = "function one() {\n  return 1;\n}\n\nfunction two() {\n  return 2;\n}\n\nclass Widget {\n  render() {\n    return 3;\n  }\n}\n";
+
+    const MD_SAMPLE: &str = "# Title\n\nIntro paragraph.\n\n## Install\n\nRun the installer.\n\n## Usage\n\nCall the tool.\n";
+
+    /// `max_tokens` budgets the code-chunker tests run against.
+    const CODE_MAX_TOKENS: [usize; 3] = [50, 100, 200];
+
+    /// Code samples chunked once per `CODE_MAX_TOKENS` entry, so the tree-sitter parse runs
+    /// once per budget instead of once per assertion.
+    static PY_CHUNKS: Lazy<Vec<Vec<Chunk>>> = Lazy::new(|| {
+        let info = file_info("test.py", "python");
+        CODE_MAX_TOKENS
+            .iter()
+            .map(|&max| chunk_content(&info, PY_SAMPLE, max, 20).expect("chunks"))
+            .collect()
+    });
+    static JS_CHUNKS: Lazy<Vec<Vec<Chunk>>> = Lazy::new(|| {
+        let info = file_info("test.js", "javascript");
+        CODE_MAX_TOKENS
+            .iter()
+            .map(|&max| chunk_content(&info, JS_SAMPLE, max, 20).expect("chunks"))
+            .collect()
+    });
+
+    /// Chunk `i` of `test.py`: lines `i*10+1..=(i+1)*10`, with content sized so that
+    /// `estimate_tokens` agrees with `tokens`. Override fields with struct update syntax.
+    fn mk_chunk(i: usize, tokens: usize) -> Chunk {
+        let start_line = i * 10 + 1;
+        let content = "a".repeat((tokens * 4).saturating_sub(1)) + "\n";
+        Chunk {
+            id: format!("chunk{i}"),
+            path: "test.py".to_string(),
+            language: "python".to_string(),
+            start_line,
+            end_line: start_line + 9,
+            content,
+            priority: 0.5,
+            tags: BTreeSet::new(),
+            token_estimate: tokens,
+        }
+    }
+
+    fn file_info(relative_path: &str, language: &str) -> FileInfo {
+        FileInfo {
+            path: PathBuf::from("/tmp").join(relative_path),
+            relative_path: relative_path.to_string(),
+            size_bytes: 0,
+            extension: String::new(),
+            language: language.to_string(),
+            id: "x".to_string(),
+            priority: 0.5,
+            token_estimate: 0,
+            tags: BTreeSet::new(),
+            is_readme: false,
+            is_config: false,
+            is_doc: false,
+        }
+    }
+
+    #[test]
+    fn test_chunks_simple_content() {
+        let info = file_info("test.txt", "text");
+        let chunks = chunk_content(&info, &LINES_100, 50, 0).expect("chunks");
+        assert!(chunks.len() > 1);
+        assert_eq!(chunks[0].start_line, 1);
+        assert_eq!(chunks.last().map(|c| c.end_line), Some(100));
+    }
+
+    #[test]
+    fn test_chunks_have_overlap() {
+        let info = file_info("test.txt", "text");
+        let chunks = chunk_content(&info, &LINES_100, 50, 10).expect("chunks");
+        assert!(chunks.len() > 1);
+        assert!(chunks[1].start_line <= chunks[0].end_line);
+    }
+
+    #[test]
+    fn test_chunks_python_by_functions() {
+        for chunks in PY_CHUNKS.iter() {
+            assert!(chunks.len() >= 2);
+            assert!(chunks.iter().any(|c| c.tags.contains("def:function_one")));
+            assert!(chunks.iter().any(|c| c.tags.contains("type:MyClass")));
+        }
+    }
+
+    #[test]
+    fn test_chunks_javascript_by_functions() {
+        for chunks in JS_CHUNKS.iter() {
+            assert!(chunks.len() >= 2);
+            assert!(chunks.iter().any(|c| c.tags.contains("def:one")));
+            assert!(chunks.iter().any(|c| c.tags.contains("type:Widget")));
+        }
+    }
+
+    #[test]
+    fn test_code_chunks_keep_language_and_path() {
+        for chunks in PY_CHUNKS.iter() {
+            assert!(chunks.iter().all(|c| c.language == "python" && c.path == "test.py"));
+        }
+        for chunks in JS_CHUNKS.iter() {
+            assert!(chunks.iter().all(|c| c.language == "javascript" && c.path == "test.js"));
+        }
+    }
+
+    #[test]
+    fn test_chunks_markdown_by_headings() {
+        let info = file_info("README.md", "markdown");
+        let chunks = chunk_content(&info, MD_SAMPLE, 1000, 0).expect("chunks");
+        assert_eq!(chunks.len(), 3);
+        assert!(chunks.iter().any(|c| c.tags.contains("section:Install")));
+        assert!(chunks.iter().any(|c| c.tags.contains("section:Usage")));
+    }
+
+    #[test]
+    fn test_chunk_ids_are_stable() {
+        let info = file_info("test.txt", "text");
+        let first = chunk_content(&info, &LINES_100, 1000, 100).expect("chunks");
+        let second = chunk_content(&info, &LINES_100, 1000, 100).expect("chunks");
+        let first_ids: Vec<&str> = first.iter().map(|c| c.id.as_str()).collect();
+        let second_ids: Vec<&str> = second.iter().map(|c| c.id.as_str()).collect();
+        assert_eq!(first_ids, second_ids);
+    }
+
+    #[test]
+    fn test_coalesces_small_chunks_from_same_file() {
+        let merged =
+            coalesce_small_chunks_with_max(vec![mk_chunk(0, 20), mk_chunk(1, 20)], 200, 800);
+        assert_eq!(merged.len(), 1);
+        assert_eq!((merged[0].start_line, merged[0].end_line), (1, 20));
+        assert_eq!(merged[0].token_estimate, 40);
+    }
+
+    #[test]
+    fn test_does_not_coalesce_different_files() {
+        let other = Chunk { path: "other.py".to_string(), ..mk_chunk(1, 20) };
+        let merged = coalesce_small_chunks_with_max(vec![mk_chunk(0, 20), other], 200, 800);
+        assert_eq!(merged.len(), 2);
+    }
+
+    #[test]
+    fn test_does_not_coalesce_non_adjacent_chunks() {
+        let distant = Chunk { start_line: 50, end_line: 59, ..mk_chunk(1, 20) };
+        let merged = coalesce_small_chunks_with_max(vec![mk_chunk(0, 20), distant], 200, 800);
+        assert_eq!(merged.len(), 2);
+    }
+
+    #[test]
+    fn test_respects_max_tokens() {
+        let chunks: Vec<Chunk> = (0..5).map(|i| mk_chunk(i, 100)).collect();
+        let merged = coalesce_small_chunks_with_max(chunks, 200, 250);
+        assert_eq!(merged.len(), 3);
+        assert!(merged.iter().all(|c| c.token_estimate <= 250));
+    }
+
+    #[test]
+    fn test_coalesce_handles_empty_list() {
+        assert!(coalesce_small_chunks_with_max(Vec::new(), 200, 800).is_empty());
+    }
+}
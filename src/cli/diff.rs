@@ -6,6 +6,7 @@ use rusqlite::Connection;
 use serde::{Deserialize, Serialize};
 use std::collections::{BTreeSet, HashMap, HashSet};
 use std::fs;
+use std::io::{BufRead, BufReader};
 use std::path::{Path, PathBuf};
 
 #[derive(Args)]
@@ -294,9 +295,9 @@ fn render_markdown(summary: &DiffSummary) {
 
 fn read_report(dir: &Path) -> Result<ReportDoc> {
     let path = resolve_output_artifact(dir, "report.json")?;
-    let data = fs::read_to_string(&path)
+    let data = fs::read(&path)
         .with_context(|| format!("Failed to read report.json at {}", path.display()))?;
-    serde_json::from_str::<ReportDoc>(&data)
+    serde_json::from_slice::<ReportDoc>(&data)
         .with_context(|| format!("Failed to parse JSON at {}", path.display()))
 }
 
@@ -304,11 +305,24 @@ fn read_chunks(dir: &Path) -> Result<Vec<ChunkRow>> {
     let Some(path) = resolve_output_artifact_optional(dir, "chunks.jsonl")? else {
         return Ok(Vec::new());
     };
-    let content = fs::read_to_string(&path)
+    let file = fs::File::open(&path)
         .with_context(|| format!("Failed to read chunks.jsonl at {}", path.display()))?;
+    // Stream line by line through one reused buffer rather than holding the whole file.
+    let mut reader = BufReader::new(file);
+    let mut line = String::new();
     let mut rows = Vec::new();
-    for line in content.lines().filter(|line| !line.trim().is_empty()) {
-        if let Ok(row) = serde_json::from_str::<ChunkRow>(line) {
+    loop {
+        line.clear();
+        let read = reader
+            .read_line(&mut line)
+            .with_context(|| format!("Failed to read chunks.jsonl at {}", path.display()))?;
+        if read == 0 {
+            break;
+        }
+        if line.trim().is_empty() {
+            continue;
+        }
+        if let Ok(row) = serde_json::from_str::<ChunkRow>(&line) {
             rows.push(row);
         }
     }
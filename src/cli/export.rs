@@ -3,8 +3,10 @@
 use anyhow::{Context, Result};
 use clap::Args;
 use globset::{Glob, GlobSet, GlobSetBuilder};
+use rayon::prelude::*;
 use serde_json::json;
 use sha2::{Digest, Sha256};
+use std::borrow::Cow;
 use std::collections::{BTreeMap, BTreeSet, HashMap, HashSet};
 use std::fs;
 use std::io::IsTerminal;
@@ -26,7 +28,7 @@ use crate::rank::{
     dependency_graph, rank_files_with_manifest, rerank_chunks_by_task, stitch_thread_bundles,
     symbol_definitions, StitchTier,
 };
-use crate::redact::Redactor;
+use crate::redact::{RedactionOutcome, Redactor};
 use crate::render::{render_context_pack, render_jsonl, write_report, ReportOptions};
 use crate::rerank::{build_reranker, normalize_scores};
 use crate::scan::scanner::FileScanner;
@@ -427,20 +429,20 @@ pub fn run(args: ExportArgs) -> Result<()> {
     }
 
     let mut always_tokens = 0usize;
-    for idx in always_indices {
-        if let Some(file_chunks) = process_file_for_export(
-            &mut selected_files[idx],
-            used_index_dataset,
-            lazy_loader.as_ref(),
-            redactor.as_ref(),
-            chunk_tokens,
-            chunk_overlap,
-            &mut stats,
-        )? {
-            let file_tokens: usize = file_chunks.iter().map(|c| c.token_estimate).sum();
-            always_tokens += file_tokens;
-            chunks.extend(file_chunks);
-        }
+    let always_processed = process_files_for_export(
+        &mut selected_files,
+        &always_indices,
+        used_index_dataset,
+        lazy_loader.as_ref(),
+        redactor.as_ref(),
+        chunk_tokens,
+        chunk_overlap,
+        &mut stats,
+    )?;
+    for file_chunks in always_processed.into_iter().flatten() {
+        let file_tokens: usize = file_chunks.iter().map(|c| c.token_estimate).sum();
+        always_tokens += file_tokens;
+        chunks.extend(file_chunks);
     }
 
     let mut pinned_only_mode = false;
@@ -487,17 +489,18 @@ pub fn run(args: ExportArgs) -> Result<()> {
         budgeted_indices.extend(normal_indices);
     }
 
-    for idx in budgeted_indices {
-        let Some(file_chunks) = process_file_for_export(
-            &mut selected_files[idx],
-            used_index_dataset,
-            lazy_loader.as_ref(),
-            redactor.as_ref(),
-            chunk_tokens,
-            chunk_overlap,
-            &mut stats,
-        )?
-        else {
+    let budgeted_processed = process_files_for_export(
+        &mut selected_files,
+        &budgeted_indices,
+        used_index_dataset,
+        lazy_loader.as_ref(),
+        redactor.as_ref(),
+        chunk_tokens,
+        chunk_overlap,
+        &mut stats,
+    )?;
+    for (idx, processed) in budgeted_indices.into_iter().zip(budgeted_processed) {
+        let Some(file_chunks) = processed else {
             continue;
         };
 
@@ -650,8 +653,7 @@ pub fn run(args: ExportArgs) -> Result<()> {
         }
     }
 
-    stats.chunks_created = chunks.len();
-    stats.total_tokens_estimated = chunks.iter().map(|c| c.token_estimate).sum();
+    stats.record_chunks(&chunks);
 
     let output_dir = resolve_output_dir(&merged.output_dir, &root_path, merged.repo_url.as_deref());
     let repo_name = repo_name_for_output(&root_path, merged.repo_url.as_deref());
@@ -871,7 +873,8 @@ pub fn run(args: ExportArgs) -> Result<()> {
         || stats.files_skipped_binary > 0
         || stats.files_skipped_extension > 0
         || stats.files_skipped_gitignore > 0
-        || stats.files_skipped_glob > 0;
+        || stats.files_skipped_glob > 0
+        || stats.files_skipped_symlink > 0;
     if any_skipped {
         println!("  Files skipped:");
         if stats.files_skipped_size > 0 {
@@ -889,6 +892,9 @@ pub fn run(args: ExportArgs) -> Result<()> {
         if stats.files_skipped_glob > 0 {
             println!("    glob/minify: {}", stats.files_skipped_glob);
         }
+        if stats.files_skipped_symlink > 0 {
+            println!("    symlink:     {}", stats.files_skipped_symlink);
+        }
     }
 
     if stats.files_dropped_budget > 0 {
@@ -1124,8 +1130,8 @@ fn build_coverage_report(
         .iter()
         .filter_map(|entry| entry.get("path").and_then(|v| v.as_str()).map(|p| p.to_string()))
         .collect();
-    let included_paths: HashSet<String> =
-        selected_files.iter().map(|f| f.relative_path.clone()).collect();
+    let included_paths: HashSet<&str> =
+        selected_files.iter().map(|f| f.relative_path.as_str()).collect();
     let most_imported_not_included = most_imported_not_included(
         index_db_path,
         &dropped_paths,
@@ -1162,7 +1168,7 @@ fn build_coverage_report(
 fn most_imported_not_included(
     index_db_path: Option<&Path>,
     dropped_paths: &[String],
-    included_paths: &HashSet<String>,
+    included_paths: &HashSet<&str>,
     dropped_entries: &[HashMap<String, serde_json::Value>],
 ) -> Vec<serde_json::Value> {
     if dropped_paths.is_empty() {
@@ -1201,7 +1207,7 @@ fn most_imported_not_included(
                             continue;
                         }
                         *inbound_all.entry(target.clone()).or_insert(0) += 1;
-                        if included_paths.contains(&source) {
+                        if included_paths.contains(source.as_str()) {
                             *inbound_from_included.entry(target).or_insert(0) += 1;
                         }
                     }
@@ -1601,6 +1607,54 @@ fn extract_workspace_members(
     members
 }
 
+/// Run `process_file_for_export` for every file in `indices` on the rayon pool.
+///
+/// Reading, redacting and chunking a file only touch that file, so files are processed in
+/// parallel with their own stats, which are added into `stats` afterwards. Results come back
+/// in `indices` order, and the first error in that order is returned.
+#[allow(clippy::too_many_arguments)]
+fn process_files_for_export(
+    files: &mut [crate::domain::FileInfo],
+    indices: &[usize],
+    use_index_first: bool,
+    lazy_loader: Option<&LazyChunkLoader>,
+    redactor: Option<&Redactor>,
+    chunk_tokens: usize,
+    chunk_overlap: usize,
+    stats: &mut crate::domain::ScanStats,
+) -> Result<Vec<Option<Vec<Chunk>>>> {
+    let mut wanted = vec![false; files.len()];
+    for &idx in indices {
+        wanted[idx] = true;
+    }
+    let mut processed: HashMap<usize, _> = files
+        .par_iter_mut()
+        .enumerate()
+        .filter(|(idx, _)| wanted[*idx])
+        .map(|(idx, file)| {
+            let mut file_stats = crate::domain::ScanStats::default();
+            let result = process_file_for_export(
+                file,
+                use_index_first,
+                lazy_loader,
+                redactor,
+                chunk_tokens,
+                chunk_overlap,
+                &mut file_stats,
+            );
+            (idx, (result, file_stats))
+        })
+        .collect();
+
+    let mut results = Vec::with_capacity(indices.len());
+    for idx in indices {
+        let (result, file_stats) = processed.remove(idx).expect("every index was processed");
+        stats.merge(file_stats);
+        results.push(result?);
+    }
+    Ok(results)
+}
+
 fn process_file_for_export(
     file: &mut crate::domain::FileInfo,
     use_index_first: bool,
@@ -1638,33 +1692,35 @@ fn process_export_file_from_index(
     if let Some(r) = redactor {
         let filename = file.path.file_name().and_then(|n| n.to_str()).unwrap_or("");
         if !r.is_file_allowlisted(filename, &file.relative_path) {
-            let mut rule_file_sets: BTreeMap<String, HashSet<String>> = BTreeMap::new();
+            // Every count here belongs to this one file, so each rule that fired adds one
+            // to its file count; no per-rule path sets are needed.
+            let mut fired_rules: BTreeSet<&'static str> = BTreeSet::new();
             for chunk in &mut file_chunks {
-                let original = chunk.content.clone();
-                let outcome = r.redact_with_language_report(
+                let RedactionOutcome { content, counts } = r.redact_with_language_report(
                     &chunk.content,
                     &file.language,
                     &file.extension,
                     filename,
                     &file.relative_path,
                 );
-                if outcome.content != original {
-                    chunk.content = outcome.content;
+                // A borrowed result means nothing was redacted: no copy, no comparison.
+                let Cow::Owned(redacted) = content else {
+                    continue;
+                };
+                if redacted != chunk.content {
+                    chunk.content = redacted;
                     chunk.tags.insert("redacted".to_string());
                     stats.redacted_chunks += 1;
-                    for (rule, count) in &outcome.counts {
-                        *stats.redaction_counts.entry(rule.clone()).or_insert(0) += count;
-                        rule_file_sets
-                            .entry(rule.clone())
-                            .or_default()
-                            .insert(file.relative_path.clone());
+                    for (rule, count) in counts {
+                        add_rule_count(&mut stats.redaction_counts, rule, count);
+                        fired_rules.insert(rule);
                     }
                 }
             }
-            if !rule_file_sets.is_empty() {
+            if !fired_rules.is_empty() {
                 stats.redacted_files += 1;
-                for (rule, file_set) in rule_file_sets {
-                    *stats.redaction_file_counts.entry(rule).or_insert(0) += file_set.len();
+                for rule in fired_rules {
+                    add_rule_count(&mut stats.redaction_file_counts, rule, 1);
                 }
             }
         }
@@ -1674,6 +1730,17 @@ fn process_export_file_from_index(
     Ok(Some(file_chunks))
 }
 
+/// Adds `count` to `rule`'s tally, allocating the owned key only the first time the rule
+/// is seen rather than once per redacted chunk.
+fn add_rule_count(counts: &mut BTreeMap<String, usize>, rule: &str, count: usize) {
+    match counts.get_mut(rule) {
+        Some(total) => *total += count,
+        None => {
+            counts.insert(rule.to_string(), count);
+        }
+    }
+}
+
 fn process_export_file(
     file: &mut crate::domain::FileInfo,
     redactor: Option<&Redactor>,
@@ -1691,7 +1758,6 @@ fn process_export_file(
         if r.is_file_allowlisted(filename, &file.relative_path) {
             content
         } else {
-            use std::collections::{BTreeMap, HashSet};
             let outcome = r.redact_with_language_report(
                 &content,
                 &file.language,
@@ -1699,20 +1765,20 @@ fn process_export_file(
                 filename,
                 &file.relative_path,
             );
-            if outcome.content != content {
-                let mut rule_file_sets: BTreeMap<String, HashSet<String>> = BTreeMap::new();
-                for (rule, count) in &outcome.counts {
-                    *stats.redaction_counts.entry(rule.clone()).or_insert(0) += count;
-                    rule_file_sets
-                        .entry(rule.clone())
-                        .or_default()
-                        .insert(file.relative_path.clone());
+            // A borrowed result means nothing was redacted: no copy, no comparison.
+            let redacted = match outcome.content {
+                Cow::Owned(redacted) => Some(redacted),
+                Cow::Borrowed(_) => None,
+            };
+            let counts = outcome.counts;
+            if let Some(redacted) = redacted.filter(|redacted| *redacted != content) {
+                // Each rule in `counts` fired in this file, which adds one to its file count.
+                for (rule, count) in counts {
+                    add_rule_count(&mut stats.redaction_counts, rule, count);
+                    add_rule_count(&mut stats.redaction_file_counts, rule, 1);
                 }
                 stats.redacted_files += 1;
-                for (rule, file_set) in rule_file_sets {
-                    *stats.redaction_file_counts.entry(rule).or_insert(0) += file_set.len();
-                }
-                outcome.content
+                redacted
             } else {
                 content
             }
@@ -2118,11 +2184,13 @@ fn apply_byte_budget(
 #[cfg(test)]
 mod tests {
     use super::{
-        apply_guided_plan, build_pin_plan, most_imported_not_included, repo_name_for_output,
-        repo_name_from_remote_url, sort_chunks_for_stitch_story, ExportArgs, GuidedPlan, PinTier,
+        apply_guided_plan, build_pin_plan, most_imported_not_included, process_files_for_export,
+        repo_name_for_output, repo_name_from_remote_url, sort_chunks_for_stitch_story, ExportArgs,
+        GuidedPlan, PinTier,
     };
     use crate::domain::{Chunk, Config, OutputMode};
     use crate::rank::StitchTier;
+    use crate::redact::Redactor;
     use rusqlite::Connection;
     use std::collections::{BTreeSet, HashMap};
     use std::path::Path;
@@ -2343,6 +2411,54 @@ mod tests {
         assert_eq!(plan.tier_for("README.md"), Some(PinTier::Tier0));
     }
 
+    #[test]
+    fn parallel_file_processing_keeps_index_order_and_sums_stats() {
+        let tmp = tempfile::TempDir::new().expect("tmp");
+        let mut files: Vec<crate::domain::FileInfo> = ["a.py", "b.py", "c.py"]
+            .iter()
+            .map(|name| {
+                let content = format!("key = \"sk-abcdefghijklmnopqrstuvwxyz12345\"  # {name}\n");
+                std::fs::write(tmp.path().join(name), &content).expect("write file");
+                crate::domain::FileInfo {
+                    path: tmp.path().join(name),
+                    relative_path: name.to_string(),
+                    size_bytes: content.len() as u64,
+                    extension: ".py".to_string(),
+                    language: "python".to_string(),
+                    id: name.to_string(),
+                    priority: 0.5,
+                    token_estimate: 0,
+                    tags: BTreeSet::new(),
+                    is_readme: false,
+                    is_config: false,
+                    is_doc: false,
+                }
+            })
+            .collect();
+        let redactor = Redactor::new();
+        let mut stats = crate::domain::ScanStats::default();
+
+        let results = process_files_for_export(
+            &mut files,
+            &[2, 0],
+            false,
+            None,
+            Some(&redactor),
+            200,
+            0,
+            &mut stats,
+        )
+        .expect("process files");
+
+        let paths: Vec<&str> =
+            results.iter().map(|r| r.as_ref().expect("chunks")[0].path.as_str()).collect();
+        assert_eq!(paths, vec!["c.py", "a.py"]);
+        assert_eq!(stats.redacted_files, 2);
+        assert_eq!(stats.redaction_file_counts.values().max(), Some(&2));
+        assert!(files[0].token_estimate > 0);
+        assert_eq!(files[1].token_estimate, 0);
+    }
+
     #[test]
     fn most_imported_not_included_prefers_incoming_edges_from_included() {
         let tmp = tempfile::TempDir::new().expect("tmp");
@@ -2370,7 +2486,7 @@ mod tests {
         .expect("insert edge 3");
 
         let dropped_paths = vec!["src/x.rs".to_string(), "src/y.rs".to_string()];
-        let included_paths = std::collections::HashSet::from(["src/a.rs".to_string()]);
+        let included_paths = std::collections::HashSet::from(["src/a.rs"]);
         let dropped_entries = vec![
             HashMap::from([
                 ("path".to_string(), serde_json::json!("src/x.rs")),
@@ -146,7 +146,27 @@ fn discover_config(repo_root: &Path) -> Option<std::path::PathBuf> {
 mod tests {
     use super::*;
     use std::fs;
-    use tempfile::TempDir;
+    use std::io::Write;
+    use tempfile::{NamedTempFile, TempDir};
+
+    /// Invalid bodies shared by the explicit (hard error) and auto-discovered (soft default)
+    /// tests, kept as bytes so they go straight to the file without re-encoding.
+    const BAD_EXTENSIONS_TYPE: &[u8] = b"include_extensions = 123\n";
+    const BAD_EXTENSIONS_MIXED: &[u8] = b"include_extensions = [\".py\", 123]\n";
+    const BAD_GLOBS_TYPE: &[u8] = b"exclude_globs = false\n";
+
+    /// Write `body` to a standalone temp file with the given suffix. Explicit-path tests don't
+    /// rely on discovery, so they skip the per-test directory and its recursive cleanup.
+    fn explicit_config(suffix: &str, body: impl AsRef<[u8]>) -> NamedTempFile {
+        let mut file = tempfile::Builder::new().suffix(suffix).tempfile().expect("tmp");
+        file.write_all(body.as_ref()).expect("write");
+        file.flush().expect("flush");
+        file
+    }
+
+    fn load_explicit(file: &NamedTempFile) -> Result<Config> {
+        load_config(file.path().parent().expect("temp parent"), Some(file.path()))
+    }
 
     #[test]
     fn test_load_config_defaults_when_missing() {
@@ -156,51 +176,107 @@ mod tests {
         assert!(cfg.repo_url.is_none());
     }
 
+    /// One auto-discovered config file and the fields it must produce.
+    struct LoadCase {
+        filename: &'static str,
+        body: &'static str,
+        check: fn(&Config),
+    }
+
+    const LOAD_CASES: &[LoadCase] = &[
+        LoadCase {
+            filename: "repo-context.toml",
+            body: "max_file_bytes = 999\nrespect_gitignore = false\nmode = 'prompt'\n",
+            check: |cfg| {
+                assert_eq!(cfg.max_file_bytes, 999);
+                assert!(!cfg.respect_gitignore);
+            },
+        },
+        LoadCase {
+            filename: ".r2p.yml",
+            body: "max_file_bytes: 4096\nchunk_tokens: 500\n",
+            check: |cfg| {
+                assert_eq!(cfg.max_file_bytes, 4096);
+                assert_eq!(cfg.chunk_tokens, 500);
+            },
+        },
+        LoadCase {
+            filename: "r2p.yaml",
+            body: "r2p:\n  max_file_bytes: 2048\n  skip_minified: false\n",
+            check: |cfg| {
+                assert_eq!(cfg.max_file_bytes, 2048);
+                assert!(!cfg.skip_minified);
+            },
+        },
+        LoadCase {
+            filename: "repo-context.toml",
+            body: "[repo-context]\nchunk_tokens = 1000\nchunk_overlap = 50\n",
+            check: |cfg| {
+                assert_eq!(cfg.chunk_tokens, 1000);
+                assert_eq!(cfg.chunk_overlap, 50);
+            },
+        },
+        LoadCase {
+            filename: "r2p.toml",
+            body: "include_extensions = \"py,rs\"\n",
+            check: |cfg| {
+                assert!(cfg.include_extensions.contains(".py"));
+                assert!(cfg.include_extensions.contains(".rs"));
+                assert_eq!(cfg.include_extensions.len(), 2);
+            },
+        },
+        LoadCase {
+            filename: "repo-context.toml",
+            body: "[ranking_weights]\nreadme = 0.95\ntest = 0.3\n",
+            check: |cfg| {
+                assert_eq!(cfg.ranking_weights.readme, 0.95);
+                assert_eq!(cfg.ranking_weights.test, 0.3);
+                assert_eq!(cfg.ranking_weights.config, 0.90);
+            },
+        },
+    ];
+
     #[test]
-    fn test_load_toml_config() {
+    fn test_load_config_cases() {
         let tmp = TempDir::new().expect("tmp");
-        let path = tmp.path().join("repo-context.toml");
-        fs::write(&path, "max_file_bytes = 999\nrespect_gitignore = false\nmode = 'prompt'\n")
-            .expect("write");
-
-        let cfg = load_config(tmp.path(), None).expect("config");
-        assert_eq!(cfg.max_file_bytes, 999);
-        assert!(!cfg.respect_gitignore);
+        for (idx, case) in LOAD_CASES.iter().enumerate() {
+            let root = tmp.path().join(idx.to_string());
+            fs::create_dir(&root).expect("mkdir");
+            fs::write(root.join(case.filename), case.body).expect("write");
+
+            let cfg = load_config(&root, None)
+                .unwrap_or_else(|e| panic!("case {idx} ({}) failed: {e}", case.filename));
+            (case.check)(&cfg);
+        }
     }
 
     // --- Test 1: Explicit config with invalid type for include_extensions ---
     #[test]
     fn test_explicit_config_invalid_type_returns_err() {
-        let tmp = TempDir::new().expect("tmp");
-        let path = tmp.path().join("bad.toml");
         // include_extensions expects a string or array, not an integer
-        fs::write(&path, "include_extensions = 123\n").expect("write");
+        let file = explicit_config(".toml", BAD_EXTENSIONS_TYPE);
 
-        let result = load_config(tmp.path(), Some(&path));
+        let result = load_explicit(&file);
         assert!(result.is_err(), "explicit config with invalid type should return Err");
     }
 
     // --- Test 2: Explicit config with mixed-type list (string + integer) ---
     #[test]
     fn test_explicit_config_mixed_type_list_returns_err() {
-        let tmp = TempDir::new().expect("tmp");
-        let path = tmp.path().join("bad.toml");
         // A list with a mix of strings and integers should fail deserialization
-        fs::write(&path, "include_extensions = [\".py\", 123]\n").expect("write");
+        let file = explicit_config(".toml", BAD_EXTENSIONS_MIXED);
 
-        let result = load_config(tmp.path(), Some(&path));
+        let result = load_explicit(&file);
         assert!(result.is_err(), "explicit config with mixed-type list should return Err");
     }
 
     // --- Test 3: Explicit config with invalid globs type ---
     #[test]
     fn test_explicit_config_invalid_globs_type_returns_err() {
-        let tmp = TempDir::new().expect("tmp");
-        let path = tmp.path().join("bad.toml");
         // exclude_globs expects a string or array, not a boolean
-        fs::write(&path, "exclude_globs = false\n").expect("write");
+        let file = explicit_config(".toml", BAD_GLOBS_TYPE);
 
-        let result = load_config(tmp.path(), Some(&path));
+        let result = load_explicit(&file);
         assert!(result.is_err(), "explicit config with boolean exclude_globs should return Err");
     }
 
@@ -209,8 +285,7 @@ mod tests {
     fn test_auto_discovered_invalid_type_returns_default() {
         let tmp = TempDir::new().expect("tmp");
         // Write a bad config at the auto-discovery location
-        fs::write(tmp.path().join("repo-context.toml"), "include_extensions = 123\n")
-            .expect("write");
+        fs::write(tmp.path().join("repo-context.toml"), BAD_EXTENSIONS_TYPE).expect("write");
 
         // Auto-discover: no explicit path provided — should soft-warn and return default
         let cfg = load_config(tmp.path(), None).expect("should not error on auto-discovery");
@@ -222,8 +297,7 @@ mod tests {
     #[test]
     fn test_auto_discovered_mixed_type_list_returns_default() {
         let tmp = TempDir::new().expect("tmp");
-        fs::write(tmp.path().join("repo-context.toml"), "include_extensions = [\".py\", 123]\n")
-            .expect("write");
+        fs::write(tmp.path().join("repo-context.toml"), BAD_EXTENSIONS_MIXED).expect("write");
 
         let cfg = load_config(tmp.path(), None).expect("should not error on auto-discovery");
         assert_eq!(cfg.max_file_bytes, crate::domain::Config::default().max_file_bytes);
@@ -232,11 +306,9 @@ mod tests {
     // --- Test 6: String normalization: comma-separated include_extensions ---
     #[test]
     fn test_string_normalization_comma_separated_extensions() {
-        let tmp = TempDir::new().expect("tmp");
-        let path = tmp.path().join("r2p.toml");
-        fs::write(&path, "include_extensions = \"py, js,  ts\"\n").expect("write");
+        let file = explicit_config(".toml", "include_extensions = \"py, js,  ts\"\n");
 
-        let cfg = load_config(tmp.path(), Some(&path)).expect("config");
+        let cfg = load_explicit(&file).expect("config");
         let exts: std::collections::HashSet<String> = cfg.include_extensions.into_iter().collect();
         assert!(exts.contains(".py"), "should contain .py");
         assert!(exts.contains(".js"), "should contain .js");
@@ -246,12 +318,10 @@ mod tests {
     // --- Test 7: List normalization: array with/without dots and whitespace ---
     #[test]
     fn test_list_normalization_extensions_array() {
-        let tmp = TempDir::new().expect("tmp");
-        let path = tmp.path().join("r2p.toml");
         // ".py" already has dot, "js" needs one added, "  ts  " needs trimming + dot
-        fs::write(&path, "include_extensions = [\".py\", \"js\", \"  ts  \"]\n").expect("write");
+        let file = explicit_config(".toml", "include_extensions = [\".py\", \"js\", \"  ts  \"]\n");
 
-        let cfg = load_config(tmp.path(), Some(&path)).expect("config");
+        let cfg = load_explicit(&file).expect("config");
         let exts: std::collections::HashSet<String> = cfg.include_extensions.into_iter().collect();
         assert!(exts.contains(".py"), "should contain .py");
         assert!(exts.contains(".js"), "should contain .js");
@@ -261,11 +331,9 @@ mod tests {
     // --- Test 8: Glob normalization: comma-separated exclude_globs ---
     #[test]
     fn test_glob_normalization_comma_separated() {
-        let tmp = TempDir::new().expect("tmp");
-        let path = tmp.path().join("r2p.toml");
-        fs::write(&path, "exclude_globs = \"dist, build ,  node_modules\"\n").expect("write");
+        let file = explicit_config(".toml", "exclude_globs = \"dist, build ,  node_modules\"\n");
 
-        let cfg = load_config(tmp.path(), Some(&path)).expect("config");
+        let cfg = load_explicit(&file).expect("config");
         let globs: std::collections::HashSet<String> = cfg.exclude_globs.into_iter().collect();
         assert!(globs.contains("dist"), "should contain dist");
         assert!(globs.contains("build"), "should contain build");
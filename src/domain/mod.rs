@@ -3,6 +3,7 @@
 //! Equivalent to Python's config.py - defines FileInfo, Chunk, Config, etc.
 
 use serde::{Deserialize, Serialize};
+use std::borrow::Cow;
 use std::collections::{BTreeMap, BTreeSet, HashMap, HashSet};
 use std::path::PathBuf;
 
@@ -142,6 +143,10 @@ pub struct ScanStats {
     #[serde(default)]
     pub files_skipped_glob: usize,
 
+    /// Files skipped as symlink aliases of a file already included
+    #[serde(default)]
+    pub files_skipped_symlink: usize,
+
     /// Files skipped due to filters (legacy, kept for compatibility)
     #[serde(default)]
     pub files_skipped: usize,
@@ -219,6 +224,89 @@ pub struct ScanStats {
 }
 
 impl ScanStats {
+    /// Derive the chunk totals (`chunks_created`, `total_tokens_estimated`) from the final
+    /// chunk list, so callers never set one without the other.
+    pub fn record_chunks(&mut self, chunks: &[Chunk]) {
+        self.chunks_created = chunks.len();
+        self.total_tokens_estimated = chunks.iter().map(|c| c.token_estimate).sum();
+    }
+
+    /// Add the stats recorded by a separate pass (such as one file processed on a worker
+    /// thread) into these totals: counts are summed, maps merged key by key and lists
+    /// appended. The destructuring names every field, so a new field fails to compile until
+    /// it is merged here.
+    pub fn merge(&mut self, other: ScanStats) {
+        let ScanStats {
+            files_scanned,
+            files_included,
+            files_skipped_size,
+            files_skipped_binary,
+            files_skipped_extension,
+            files_skipped_gitignore,
+            files_skipped_glob,
+            files_skipped_symlink,
+            files_skipped,
+            files_dropped_budget,
+            total_bytes_scanned,
+            total_bytes_included,
+            chunks_created,
+            total_tokens_estimated,
+            languages_detected,
+            top_ignored_patterns,
+            processing_time_seconds,
+            top_ranked_files,
+            dropped_files,
+            redaction_counts,
+            redacted_chunks,
+            redacted_files,
+            redaction_chunk_counts,
+            redaction_file_counts,
+            stitched_chunks,
+            pinned_only_mode,
+            pinned_overflow_tokens,
+            pinned_files,
+        } = other;
+
+        self.files_scanned += files_scanned;
+        self.files_included += files_included;
+        self.files_skipped_size += files_skipped_size;
+        self.files_skipped_binary += files_skipped_binary;
+        self.files_skipped_extension += files_skipped_extension;
+        self.files_skipped_gitignore += files_skipped_gitignore;
+        self.files_skipped_glob += files_skipped_glob;
+        self.files_skipped_symlink += files_skipped_symlink;
+        self.files_skipped += files_skipped;
+        self.files_dropped_budget += files_dropped_budget;
+        self.total_bytes_scanned += total_bytes_scanned;
+        self.total_bytes_included += total_bytes_included;
+        self.chunks_created += chunks_created;
+        self.total_tokens_estimated += total_tokens_estimated;
+        for (language, count) in languages_detected {
+            *self.languages_detected.entry(language).or_insert(0) += count;
+        }
+        for (pattern, count) in top_ignored_patterns {
+            *self.top_ignored_patterns.entry(pattern).or_insert(0) += count;
+        }
+        self.processing_time_seconds += processing_time_seconds;
+        self.top_ranked_files.extend(top_ranked_files);
+        self.dropped_files.extend(dropped_files);
+        for (rule, count) in redaction_counts {
+            *self.redaction_counts.entry(rule).or_insert(0) += count;
+        }
+        self.redacted_chunks += redacted_chunks;
+        self.redacted_files += redacted_files;
+        for (rule, count) in redaction_chunk_counts {
+            *self.redaction_chunk_counts.entry(rule).or_insert(0) += count;
+        }
+        for (rule, count) in redaction_file_counts {
+            *self.redaction_file_counts.entry(rule).or_insert(0) += count;
+        }
+        self.stitched_chunks += stitched_chunks;
+        self.pinned_only_mode |= pinned_only_mode;
+        self.pinned_overflow_tokens += pinned_overflow_tokens;
+        self.pinned_files.extend(pinned_files);
+    }
+
     /// Produce a JSON value matching Python's report schema.
     ///
     /// Python nests the per-category skip counts under a `"files_skipped"` object
@@ -261,6 +349,12 @@ impl ScanStats {
             "processing_time_seconds": self.processing_time_seconds,
         });
 
+        // Symlink aliases are only skipped when following symlinks; the key is left out
+        // otherwise so the skip object keeps Python's shape.
+        if self.files_skipped_symlink > 0 {
+            value["files_skipped"]["symlink"] = serde_json::json!(self.files_skipped_symlink);
+        }
+
         // Only emit redacted_files and redacted_chunks when non-zero,
         // matching Python which omits these keys when redaction is not active.
         if self.redacted_files > 0 {
@@ -975,9 +1069,16 @@ pub fn default_exclude_globs() -> HashSet<String> {
 }
 
 /// Get language from file extension or special filename.
-pub fn get_language(extension: &str, filename: &str) -> String {
-    let ext = extension.to_lowercase();
-    let lang = match ext.as_str() {
+///
+/// Every known extension is ASCII, so only an extension with ASCII uppercase needs a
+/// lowercased copy; the scanner's already-lowercase extensions are matched in place.
+pub fn get_language(extension: &str, filename: &str) -> &'static str {
+    let ext: Cow<'_, str> = if extension.bytes().any(|b| b.is_ascii_uppercase()) {
+        Cow::Owned(extension.to_ascii_lowercase())
+    } else {
+        Cow::Borrowed(extension)
+    };
+    match ext.as_ref() {
         ".py" | ".pyi" | ".pyx" => "python",
         ".js" | ".jsx" | ".mjs" | ".cjs" => "javascript",
         ".ts" | ".tsx" => "typescript",
@@ -1014,21 +1115,132 @@ pub fn get_language(extension: &str, filename: &str) -> String {
         ".proto" => "protobuf",
         _ => {
             // Special filenames (no extension or empty extension)
-            let name = filename.to_lowercase();
-            if name == "dockerfile" {
-                return "dockerfile".to_string();
+            if filename.eq_ignore_ascii_case("dockerfile") {
+                return "dockerfile";
             }
-            if name == "makefile" {
-                return "makefile".to_string();
+            if filename.eq_ignore_ascii_case("makefile") {
+                return "makefile";
             }
-            if name == "rakefile" {
-                return "ruby".to_string();
+            if filename.eq_ignore_ascii_case("rakefile") {
+                return "ruby";
             }
-            if ext.is_empty() && name.ends_with("rc") {
-                return "shell".to_string();
+            let name = filename.as_bytes();
+            if ext.is_empty()
+                && name.len() >= 2
+                && name[name.len() - 2..].eq_ignore_ascii_case(b"rc")
+            {
+                return "shell";
             }
             "text"
         }
-    };
-    lang.to_string()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use serde_json::json;
+
+    #[test]
+    fn scan_stats_merge_sums_counts_and_merges_maps() {
+        let mut totals = ScanStats {
+            files_included: 1,
+            redaction_counts: BTreeMap::from([("aws".to_string(), 2)]),
+            languages_detected: HashMap::from([("python".to_string(), 1)]),
+            ..Default::default()
+        };
+        totals.merge(ScanStats {
+            files_included: 2,
+            redacted_files: 1,
+            redaction_counts: BTreeMap::from([("aws".to_string(), 1), ("jwt".to_string(), 3)]),
+            languages_detected: HashMap::from([("python".to_string(), 2)]),
+            dropped_files: vec![HashMap::new()],
+            ..Default::default()
+        });
+
+        assert_eq!(totals.files_included, 3);
+        assert_eq!(totals.redacted_files, 1);
+        assert_eq!(totals.redaction_counts["aws"], 3);
+        assert_eq!(totals.redaction_counts["jwt"], 3);
+        assert_eq!(totals.languages_detected["python"], 3);
+        assert_eq!(totals.dropped_files.len(), 1);
+    }
+
+    /// (TOML source, expected serialized fields). Deserializing covers construction defaults and
+    /// serializing covers the report/config dump, so one table exercises both directions.
+    fn ranking_weight_cases() -> Vec<(&'static str, Vec<(&'static str, f64)>)> {
+        vec![
+            ("", vec![("readme", 1.0), ("config", 0.90), ("vendored", 0.10)]),
+            (
+                "readme = 0.95\ntest = 0.3\n",
+                vec![("readme", 0.95), ("test", 0.3), ("config", 0.90)],
+            ),
+            ("vendored = 0.0\n", vec![("vendored", 0.0), ("default", 0.50)]),
+        ]
+    }
+
+    #[test]
+    fn test_ranking_weights_table() {
+        for (source, expected) in ranking_weight_cases() {
+            let weights: RankingWeights = toml::from_str(source).expect("weights");
+            let value = serde_json::to_value(&weights).expect("serialize weights");
+            for (key, want) in expected {
+                assert_eq!(value[key].as_f64(), Some(want), "{key} for {source:?}");
+            }
+        }
+    }
+
+    #[test]
+    fn test_config_serialization_table() {
+        let cases = vec![
+            (
+                "",
+                vec![
+                    ("max_file_bytes", json!(1_048_576)),
+                    ("chunk_tokens", json!(800)),
+                    ("mode", json!("both")),
+                    ("redaction_mode", json!("standard")),
+                ],
+            ),
+            (
+                "mode = 'rag'\nredaction_mode = 'structure-safe'\nchunk_overlap = 40\n",
+                vec![
+                    ("mode", json!("rag")),
+                    ("redaction_mode", json!("structure-safe")),
+                    ("chunk_overlap", json!(40)),
+                ],
+            ),
+            (
+                "[weights]\nreadme = 0.7\n",
+                vec![(
+                    "ranking_weights",
+                    serde_json::to_value(RankingWeights { readme: 0.7, ..Default::default() })
+                        .expect("serialize weights"),
+                )],
+            ),
+        ];
+
+        for (source, expected) in cases {
+            let config: Config = toml::from_str(source).expect("config");
+            let value = serde_json::to_value(&config).expect("serialize config");
+            for (key, want) in expected {
+                assert_eq!(value[key], want, "{key} for {source:?}");
+            }
+        }
+    }
+
+    #[test]
+    fn test_get_language_table() {
+        let cases = [
+            (".py", "main.py", "python"),
+            (".TSX", "App.TSX", "typescript"),
+            ("", "Dockerfile", "dockerfile"),
+            ("", "GNUmakefile", "text"),
+            ("", ".bashrc", "shell"),
+            (".bin", "blob.bin", "text"),
+        ];
+        for (extension, filename, want) in cases {
+            assert_eq!(get_language(extension, filename), want, "{filename}");
+        }
+    }
 }
@@ -19,19 +19,16 @@ pub struct WorkspaceGraph {
     pub member_roots: BTreeSet<String>,
 }
 
-pub fn discover_workspace_graph(root: &Path) -> Option<WorkspaceGraph> {
+/// Builds the workspace graph from the root manifest's `workspace.members` patterns; the
+/// caller parses the root manifest.
+pub fn workspace_graph_for_members<'a>(
+    root: &Path,
+    member_patterns: impl IntoIterator<Item = &'a str>,
+) -> Option<WorkspaceGraph> {
     let root_manifest = root.join("Cargo.toml");
-    if !root_manifest.exists() {
-        return None;
-    }
-    let (content, _) = read_file_safe(&root_manifest, None, None).ok()?;
-    let value = toml::from_str::<toml::Value>(&content).ok()?;
-    let workspace = value.get("workspace")?.as_table()?;
-    let members = workspace.get("members")?.as_array()?;
-
     let mut builder = GlobSetBuilder::new();
     let mut has_patterns = false;
-    for member in members.iter().filter_map(toml::Value::as_str) {
+    for member in member_patterns {
         if let Ok(glob) = Glob::new(member) {
             builder.add(glob);
             has_patterns = true;
@@ -144,7 +141,7 @@ fn clean_path(path: &Path) -> PathBuf {
 
 #[cfg(test)]
 mod tests {
-    use super::discover_workspace_graph;
+    use super::workspace_graph_for_members;
     use std::fs;
     use tempfile::TempDir;
 
@@ -167,7 +164,7 @@ mod tests {
         )
         .expect("cargo b");
 
-        let graph = discover_workspace_graph(tmp.path()).expect("workspace graph");
+        let graph = workspace_graph_for_members(tmp.path(), ["crates/*"]).expect("workspace graph");
         assert!(graph.member_roots.contains("crates/a"));
         assert!(graph.member_roots.contains("crates/b"));
         let a = graph.members.iter().find(|m| m.name == "a").expect("member a");
@@ -737,8 +737,8 @@ pub fn rank_files_with_weights(
     mut files: Vec<FileInfo>,
     weights: RankingWeights,
 ) -> Result<Vec<FileInfo>> {
-    let scanned_files: HashSet<String> = files.iter().map(|f| f.relative_path.clone()).collect();
-    let ranker = FileRanker::with_weights(root_path, scanned_files, weights);
+    let scanned_files: HashSet<&str> = files.iter().map(|f| f.relative_path.as_str()).collect();
+    let ranker = FileRanker::with_weights(root_path, &scanned_files, weights);
     ranker.rank_files(&mut files);
     Ok(files)
 }
@@ -750,11 +750,10 @@ pub fn rank_files_with_manifest(
     mut files: Vec<FileInfo>,
     weights: RankingWeights,
 ) -> Result<(Vec<FileInfo>, HashMap<String, JsonValue>)> {
-    let scanned_files: HashSet<String> = files.iter().map(|f| f.relative_path.clone()).collect();
-    let ranker = FileRanker::with_weights(root_path, scanned_files, weights);
+    let scanned_files: HashSet<&str> = files.iter().map(|f| f.relative_path.as_str()).collect();
+    let ranker = FileRanker::with_weights(root_path, &scanned_files, weights);
     ranker.rank_files(&mut files);
-    let manifest = ranker.get_manifest_info().clone();
-    Ok((files, manifest))
+    Ok((files, ranker.into_manifest_info()))
 }
 
 #[cfg(test)]
@@ -1,10 +1,13 @@
 //! File ranker implementation with manifest-aware entrypoint detection.
 
 use crate::domain::{FileInfo, RankingWeights};
-use crate::fetch::workspace::discover_workspace_graph;
+use crate::fetch::workspace::workspace_graph_for_members;
 use crate::utils::{
-    is_likely_generated, is_lock_file, is_vendored, normalize_path, read_file_safe,
+    is_likely_generated, is_lock_file, is_vendored, normalize_path, normalize_path_cow,
+    read_file_safe,
 };
+use rayon::prelude::*;
+use serde::{Deserialize, Deserializer};
 use serde_json::Value as JsonValue;
 use std::collections::{HashMap, HashSet};
 use std::path::{Path, PathBuf};
@@ -42,9 +45,59 @@ const IMPORTANT_CONFIG_FILES: &[&str] = &[
     "setup.cfg",
 ];
 
+// Typed views of the manifests: only the fields the ranker reads are materialized, and
+// the rest of each document (dependency tables, tool configs) is skipped while parsing.
+
+#[derive(Deserialize)]
+struct PyprojectManifest {
+    project: Option<PyprojectProject>,
+}
+
+#[derive(Deserialize)]
+struct PyprojectProject {
+    scripts: Option<toml::Table>,
+}
+
+#[derive(Deserialize)]
+struct CargoManifest {
+    package: Option<CargoPackage>,
+    workspace: Option<CargoWorkspace>,
+}
+
+#[derive(Deserialize)]
+struct CargoWorkspace {
+    members: Option<Vec<toml::Value>>,
+}
+
+#[derive(Deserialize)]
+struct CargoPackage {
+    name: Option<String>,
+}
+
+#[derive(Default, Deserialize)]
+struct PackageJsonManifest {
+    // Copied into the manifest info as-is, so an explicit `null` is kept.
+    #[serde(default, deserialize_with = "present_value")]
+    name: Option<JsonValue>,
+    #[serde(default, deserialize_with = "present_value")]
+    description: Option<JsonValue>,
+    #[serde(default, deserialize_with = "present_value")]
+    scripts: Option<JsonValue>,
+    main: Option<JsonValue>,
+    module: Option<JsonValue>,
+    types: Option<JsonValue>,
+    bin: Option<JsonValue>,
+}
+
+/// Deserializes a field that is present (even as `null`) to `Some`.
+fn present_value<'de, D: Deserializer<'de>>(
+    deserializer: D,
+) -> Result<Option<JsonValue>, D::Error> {
+    JsonValue::deserialize(deserializer).map(Some)
+}
+
 pub struct FileRanker {
     root_path: PathBuf,
-    scanned_files: HashSet<String>,
     entrypoint_candidates: HashSet<String>,
     entrypoints: HashSet<String>,
     detected_languages: HashSet<String>,
@@ -55,17 +108,16 @@ pub struct FileRanker {
 
 impl FileRanker {
     #[allow(dead_code)]
-    pub fn new(root_path: &Path, scanned_files: HashSet<String>) -> Self {
+    pub fn new(root_path: &Path, scanned_files: &HashSet<&str>) -> Self {
         Self::with_weights(root_path, scanned_files, RankingWeights::default())
     }
     pub fn with_weights(
         root_path: &Path,
-        scanned_files: HashSet<String>,
+        scanned_files: &HashSet<&str>,
         weights: RankingWeights,
     ) -> Self {
         let mut ranker = Self {
             root_path: root_path.to_path_buf(),
-            scanned_files,
             entrypoint_candidates: HashSet::new(),
             entrypoints: HashSet::new(),
             detected_languages: HashSet::new(),
@@ -74,38 +126,41 @@ impl FileRanker {
             weights,
         };
         ranker.load_manifests();
-        ranker.validate_entrypoints();
+        ranker.validate_entrypoints(scanned_files);
         ranker
     }
 
     pub fn rank_file(&self, file: &mut FileInfo) {
-        let rel_normalized = normalize_path(&file.relative_path);
+        let rel_normalized = normalize_path_cow(&file.relative_path);
         let rel_lower = rel_normalized.to_lowercase();
         let name = file.path.file_name().and_then(|n| n.to_str()).unwrap_or("").to_lowercase();
 
         file.is_readme = name.starts_with("readme");
         file.is_config = is_config_file(&name, &rel_normalized);
-        file.is_doc = is_doc_file(&name, &rel_normalized);
+        file.is_doc = is_doc_file(&name, &rel_normalized, &rel_lower);
 
-        let content_sample =
-            read_file_safe(&file.path, Some(2000), None).map(|(s, _)| s).unwrap_or_default();
+        // Each path check runs once; the priority chain and the tags below share the results.
+        let is_contribution = is_contribution_doc(&rel_lower, &name);
+        let is_workflow = is_ci_workflow(&rel_lower);
+        let is_lock = is_lock_file(&file.path);
 
         let mut priority: f64 = self.weights.default;
         if file.is_readme {
             priority = self.weights.readme;
-        } else if is_contribution_doc(&rel_normalized, &name) {
+        } else if is_contribution {
             priority = self.weights.contribution_doc;
         } else if is_important_doc(&rel_normalized, &name) {
             priority = self.weights.main_doc;
         } else if is_vendored(&file.path) {
             priority = self.weights.vendored;
-        } else if is_lock_file(&file.path) {
+        } else if is_lock {
             priority = self.weights.lock_file;
-        } else if is_likely_generated(&file.path, &content_sample) {
+        } else if is_likely_generated(&file.path, &read_content_sample(&file.path)) {
             priority = self.weights.generated;
-        } else if is_ci_workflow(&rel_lower) || file.is_config {
+        } else if is_workflow || file.is_config {
             priority = self.weights.config;
-        } else if self.entrypoints.contains(&rel_normalized) || is_common_entrypoint(&name) {
+        } else if self.entrypoints.contains(rel_normalized.as_ref()) || is_common_entrypoint(&name)
+        {
             priority = self.weights.entrypoint;
         } else if is_test_file(&name, &rel_lower) {
             priority = self.weights.test;
@@ -125,28 +180,29 @@ impl FileRanker {
         if file.is_config {
             file.tags.insert("config".to_string());
         }
-        if is_contribution_doc(&rel_normalized, &name) {
+        if is_contribution {
             file.tags.insert("contribution".to_string());
         }
-        if is_ci_workflow(&rel_lower) {
+        if is_workflow {
             file.tags.insert("workflow".to_string());
         }
         // NOTE: Python does NOT add a "docs" tag in rank_file — is_doc only affects
         // priority score. We intentionally omit the "docs" tag to match Python behavior.
-        if self.entrypoints.contains(&rel_normalized) {
+        if self.entrypoints.contains(rel_normalized.as_ref()) {
             file.tags.insert("entrypoint".to_string());
         }
-        if is_lock_file(&file.path) {
+        if is_lock {
             file.tags.insert("lock-file".to_string());
         }
     }
 
     pub fn rank_files(&self, files: &mut [FileInfo]) {
-        for file in files.iter_mut() {
-            self.rank_file(file);
-        }
+        // Scoring may read each file's head, so it runs on the rayon pool; every file is
+        // scored exactly once and the sort below only compares the stored priorities.
+        files.par_iter_mut().for_each(|file| self.rank_file(file));
 
-        files.sort_by(|a, b| {
+        // Relative paths are unique, so the tie-break makes an unstable sort deterministic.
+        files.sort_unstable_by(|a, b| {
             b.priority
                 .partial_cmp(&a.priority)
                 .unwrap_or(std::cmp::Ordering::Equal)
@@ -169,6 +225,11 @@ impl FileRanker {
         &self.manifest_info
     }
 
+    /// Consume the ranker and hand back its manifest info without copying it.
+    pub fn into_manifest_info(self) -> HashMap<String, JsonValue> {
+        self.manifest_info
+    }
+
     #[allow(dead_code)]
     pub fn get_workspace_members(&self) -> &[String] {
         &self.workspace_members
@@ -197,28 +258,20 @@ impl FileRanker {
 
         self.detected_languages.insert("python".to_string());
 
-        if let Ok(value) = toml::from_str::<toml::Value>(&content) {
-            if let Some(project) = value.get("project") {
-                if let Some(project_table) = project.as_table() {
-                    if let Some(scripts) = project_table.get("scripts") {
-                        if let Some(script_table) = scripts.as_table() {
-                            for script in script_table.values() {
-                                if let Some(target) = script.as_str() {
-                                    // Only add if module path contains a dot (matches Python guard
-                                    // ranker.py:176: "." in module_path).
-                                    let module_path = target.split(':').next().unwrap_or("");
-                                    if module_path.contains('.') {
-                                        let module = module_path.replace('.', "/");
-                                        self.entrypoint_candidates
-                                            .insert(normalize_path(&format!("{module}.py")));
-                                        self.entrypoint_candidates.insert(normalize_path(
-                                            &format!("{module}/__init__.py"),
-                                        ));
-                                    }
-                                }
-                            }
-                        }
-                    }
+        let Ok(manifest) = toml::from_str::<PyprojectManifest>(&content) else {
+            return;
+        };
+        let scripts = manifest.project.and_then(|project| project.scripts).unwrap_or_default();
+        for script in scripts.values() {
+            if let Some(target) = script.as_str() {
+                // Only add if module path contains a dot (matches Python guard
+                // ranker.py:176: "." in module_path).
+                let module_path = target.split(':').next().unwrap_or("");
+                if module_path.contains('.') {
+                    let module = module_path.replace('.', "/");
+                    self.entrypoint_candidates.insert(normalize_path(&format!("{module}.py")));
+                    self.entrypoint_candidates
+                        .insert(normalize_path(&format!("{module}/__init__.py")));
                 }
             }
         }
@@ -234,25 +287,36 @@ impl FileRanker {
             return;
         };
 
-        let Ok(value) = serde_json::from_str::<JsonValue>(&content) else {
-            return;
+        // Any valid JSON marks the repo as JavaScript. A document the typed parse rejects
+        // (not an object, or an object with a duplicated key) is read generically instead;
+        // for duplicates the last value wins, as in a plain JSON parse.
+        let manifest = match serde_json::from_str::<PackageJsonManifest>(&content) {
+            Ok(manifest) => manifest,
+            Err(_) => match serde_json::from_str::<JsonValue>(&content) {
+                Ok(value) => PackageJsonManifest::deserialize(value).unwrap_or_default(),
+                Err(_) => return,
+            },
         };
 
         self.detected_languages.insert("javascript".to_string());
 
-        for key in ["name", "description", "scripts"] {
-            if let Some(v) = value.get(key) {
-                self.manifest_info.insert(key.to_string(), v.clone());
+        for (key, v) in [
+            ("name", manifest.name),
+            ("description", manifest.description),
+            ("scripts", manifest.scripts),
+        ] {
+            if let Some(v) = v {
+                self.manifest_info.insert(key.to_string(), v);
             }
         }
 
-        for key in ["main", "module", "types"] {
-            if let Some(v) = value.get(key).and_then(JsonValue::as_str) {
+        for v in [manifest.main, manifest.module, manifest.types].iter().flatten() {
+            if let Some(v) = v.as_str() {
                 self.entrypoint_candidates.insert(normalize_path(v));
             }
         }
 
-        if let Some(bin) = value.get("bin") {
+        if let Some(bin) = manifest.bin {
             if let Some(single) = bin.as_str() {
                 self.entrypoint_candidates.insert(normalize_path(single));
             } else if let Some(bin_obj) = bin.as_object() {
@@ -308,18 +372,20 @@ impl FileRanker {
             return;
         };
 
-        if let Ok(value) = toml::from_str::<toml::Value>(&content) {
-            if let Some(package) = value.get("package") {
-                if let Some(table) = package.as_table() {
-                    if let Some(name) = table.get("name").and_then(toml::Value::as_str) {
-                        self.manifest_info
-                            .insert("name".to_string(), JsonValue::String(name.to_string()));
-                    }
-                }
-            }
+        let Ok(manifest) = toml::from_str::<CargoManifest>(&content) else {
+            return;
+        };
+        if let Some(name) = manifest.package.and_then(|package| package.name) {
+            self.manifest_info.insert("name".to_string(), JsonValue::String(name));
         }
 
-        if let Some(graph) = discover_workspace_graph(&self.root_path) {
+        // The workspace graph reuses this parse instead of reading the root manifest again.
+        let member_patterns =
+            manifest.workspace.and_then(|workspace| workspace.members).unwrap_or_default();
+        if let Some(graph) = workspace_graph_for_members(
+            &self.root_path,
+            member_patterns.iter().filter_map(toml::Value::as_str),
+        ) {
             let mut members: Vec<String> = graph.member_roots.into_iter().collect();
             members.sort();
             for member in &members {
@@ -346,15 +412,23 @@ impl FileRanker {
         // src/main.rs or src/lib.rs as entrypoint candidates (ranker.py).
     }
 
-    fn validate_entrypoints(&mut self) {
-        for candidate in &self.entrypoint_candidates {
-            if self.scanned_files.contains(candidate) || self.root_path.join(candidate).exists() {
-                self.entrypoints.insert(candidate.clone());
-            }
-        }
+    fn validate_entrypoints(&mut self, scanned_files: &HashSet<&str>) {
+        // Candidates are only read here, so they move into the entrypoint set instead of
+        // being cloned; only candidates missing from the scan touch the filesystem.
+        let candidates = std::mem::take(&mut self.entrypoint_candidates);
+        let root_path = &self.root_path;
+        self.entrypoints.extend(candidates.into_iter().filter(|candidate| {
+            scanned_files.contains(candidate.as_str()) || root_path.join(candidate).exists()
+        }));
     }
 }
 
+/// The head of a file for the generated-code check. Only read once the cheaper path
+/// checks have failed to place the file, so readmes, docs and lock files are never opened.
+fn read_content_sample(path: &Path) -> String {
+    read_file_safe(path, Some(2000), None).map(|(s, _)| s).unwrap_or_default()
+}
+
 fn is_common_entrypoint(name: &str) -> bool {
     matches!(
         name,
@@ -392,15 +466,12 @@ fn is_example_file(rel: &str) -> bool {
         || rel.starts_with("demo/")
 }
 
-fn is_doc_file(name: &str, rel: &str) -> bool {
-    let rel_lower = rel.to_lowercase();
+fn is_doc_file(name: &str, rel: &str, rel_lower: &str) -> bool {
     // Check extension: .md, .rst, .txt, .adoc are considered doc files (matches Python is_doc)
-    let ext = std::path::Path::new(name)
-        .extension()
-        .and_then(|e| e.to_str())
-        .map(|e| format!(".{}", e.to_lowercase()))
-        .unwrap_or_default();
-    let is_doc_ext = matches!(ext.as_str(), ".md" | ".rst" | ".txt" | ".adoc");
+    let is_doc_ext =
+        std::path::Path::new(name).extension().and_then(|e| e.to_str()).is_some_and(|ext| {
+            ["md", "rst", "txt", "adoc"].iter().any(|doc| ext.eq_ignore_ascii_case(doc))
+        });
 
     is_important_doc(rel, name)
         || is_doc_ext
@@ -410,21 +481,22 @@ fn is_doc_file(name: &str, rel: &str) -> bool {
 
 fn is_important_doc(rel: &str, name: &str) -> bool {
     IMPORTANT_DOC_FILES.contains(&rel)
-        || IMPORTANT_DOC_FILES.contains(&name)
-        || IMPORTANT_DOC_FILES.iter().any(|d| d.to_lowercase() == name.to_lowercase())
+        || IMPORTANT_DOC_FILES.iter().any(|d| d.eq_ignore_ascii_case(name))
 }
 
-fn is_contribution_doc(rel: &str, name: &str) -> bool {
-    let rel_lower = rel.to_lowercase();
-    let name_lower = name.to_lowercase();
+/// `rel_lower` and `name` must already be lowercase.
+fn is_contribution_doc(rel_lower: &str, name: &str) -> bool {
     if rel_lower.starts_with(".github/pull_request_template")
         || rel_lower.starts_with(".github/issue_template/")
     {
         return true;
     }
-    CONTRIBUTION_DOC_PREFIXES
-        .iter()
-        .any(|prefix| name_lower.starts_with(prefix) || rel_lower.contains(&format!("/{prefix}")))
+    // A prefix at the start of the name, or of any path segment after the first; one walk
+    // over the separators replaces a formatted `contains` per prefix.
+    let has_prefix =
+        |segment: &str| CONTRIBUTION_DOC_PREFIXES.iter().any(|prefix| segment.starts_with(prefix));
+    has_prefix(name)
+        || rel_lower.match_indices('/').any(|(end, _)| has_prefix(&rel_lower[end + 1..]))
 }
 
 fn is_ci_workflow(rel: &str) -> bool {
@@ -441,7 +513,7 @@ fn is_api_definition(name: &str) -> bool {
 
 #[cfg(test)]
 mod tests {
-    use super::{FileRanker, JsonValue};
+    use super::{is_contribution_doc, FileRanker, JsonValue};
     use crate::domain::FileInfo;
     use std::collections::{BTreeSet, HashSet};
     use std::fs;
@@ -475,12 +547,53 @@ mod tests {
         fs::create_dir_all(tmp.path().join("repo_context")).expect("mkdir");
         fs::write(tmp.path().join("repo_context/cli.py"), "print('x')\n").expect("write cli");
 
-        let scanned = HashSet::from(["repo_context/cli.py".to_string()]);
-        let ranker = FileRanker::new(tmp.path(), scanned);
+        let scanned = HashSet::from(["repo_context/cli.py"]);
+        let ranker = FileRanker::new(tmp.path(), &scanned);
 
         assert!(ranker.get_entrypoints().contains("repo_context/cli.py"));
     }
 
+    #[test]
+    fn entrypoint_candidates_missing_from_scan_and_disk_are_dropped() {
+        let tmp = TempDir::new().expect("tmp");
+        fs::write(
+            tmp.path().join("package.json"),
+            r#"{"main": "nonexistent/module.js", "bin": {"tool": "bin/tool.js"}}"#,
+        )
+        .expect("write package.json");
+
+        // `bin/tool.js` is only known from the scan; it is not on disk.
+        let scanned = HashSet::from(["bin/tool.js"]);
+        let ranker = FileRanker::new(tmp.path(), &scanned);
+
+        assert!(ranker.get_entrypoints().contains("bin/tool.js"));
+        assert!(!ranker.get_entrypoints().contains("nonexistent/module.js"));
+    }
+
+    #[test]
+    fn package_json_that_is_valid_json_always_detects_javascript() {
+        for (content, expected_entrypoints) in [
+            ("null", &[][..]),
+            (r#"["index.js"]"#, &[][..]),
+            (r#"{"main": "old.js", "name": "demo", "main": "index.js"}"#, &["index.js"][..]),
+        ] {
+            let tmp = TempDir::new().expect("tmp");
+            fs::write(tmp.path().join("package.json"), content).expect("write package.json");
+
+            let scanned = HashSet::from(["index.js", "old.js"]);
+            let ranker = FileRanker::new(tmp.path(), &scanned);
+
+            assert!(ranker.get_detected_languages().contains("javascript"), "{content}");
+            let entrypoints: HashSet<&str> =
+                ranker.get_entrypoints().iter().map(String::as_str).collect();
+            assert_eq!(
+                entrypoints,
+                expected_entrypoints.iter().copied().collect::<HashSet<_>>(),
+                "{content}"
+            );
+        }
+    }
+
     #[test]
     fn readme_ranks_higher_than_test() {
         let tmp = TempDir::new().expect("tmp");
@@ -490,8 +603,8 @@ mod tests {
         fs::write(&readme_path, "# hello").expect("write readme");
         fs::write(&test_path, "def test_x(): pass\n").expect("write test");
 
-        let scanned = HashSet::from(["README.md".to_string(), "tests/test_main.py".to_string()]);
-        let ranker = FileRanker::new(tmp.path(), scanned);
+        let scanned = HashSet::from(["README.md", "tests/test_main.py"]);
+        let ranker = FileRanker::new(tmp.path(), &scanned);
 
         let mut readme = make_file(&readme_path, "README.md", ".md", "markdown");
         let mut test_file = make_file(&test_path, "tests/test_main.py", ".py", "python");
@@ -509,8 +622,8 @@ mod tests {
         fs::write(&contributing_path, "# Contributing\n").expect("write contributing");
         fs::write(&cargo_path, "[package]\nname='x'\nversion='0.1.0'\n").expect("write cargo");
 
-        let scanned = HashSet::from(["CONTRIBUTING.md".to_string(), "Cargo.toml".to_string()]);
-        let ranker = FileRanker::new(tmp.path(), scanned);
+        let scanned = HashSet::from(["CONTRIBUTING.md", "Cargo.toml"]);
+        let ranker = FileRanker::new(tmp.path(), &scanned);
 
         let mut contributing = make_file(&contributing_path, "CONTRIBUTING.md", ".md", "markdown");
         let mut cargo = make_file(&cargo_path, "Cargo.toml", ".toml", "toml");
@@ -521,6 +634,16 @@ mod tests {
         assert!(contributing.tags.contains("contribution"));
     }
 
+    #[test]
+    fn contribution_doc_matches_prefix_at_any_segment() {
+        assert!(is_contribution_doc("docs/security/policy.md", "policy.md"));
+        assert!(is_contribution_doc(".github/issue_template/bug.md", "bug.md"));
+        assert!(is_contribution_doc("contributing.md", "contributing.md"));
+        // A leading directory alone is not a segment match.
+        assert!(!is_contribution_doc("security/scan.py", "scan.py"));
+        assert!(!is_contribution_doc("src/main.rs", "main.rs"));
+    }
+
     #[test]
     fn workspace_members_add_member_entrypoints() {
         let tmp = TempDir::new().expect("tmp");
@@ -534,8 +657,8 @@ mod tests {
         .expect("write member cargo");
         fs::write(tmp.path().join("crates/a/src/main.rs"), "fn main() {}\n").expect("write main");
 
-        let scanned = HashSet::from(["crates/a/src/main.rs".to_string()]);
-        let ranker = FileRanker::new(tmp.path(), scanned);
+        let scanned = HashSet::from(["crates/a/src/main.rs"]);
+        let ranker = FileRanker::new(tmp.path(), &scanned);
         assert!(ranker.get_entrypoints().contains("crates/a/src/main.rs"));
         assert!(ranker
             .get_manifest_info()
@@ -1,36 +1,197 @@
 //! Entropy calculation for secret detection
 
+use once_cell::sync::Lazy;
 use std::collections::HashMap;
 
+/// Counts below this size use the precomputed `log2` table.
+const LOG2_TABLE_SIZE: usize = 1024;
+
+/// Inputs at least this long are counted into four private histograms; shorter ones
+/// would spend more time clearing the extra tables than they save.
+const PRIVATIZED_MIN_LEN: usize = 512;
+
+/// Shannon entropy of `s` in bits per character.
 pub fn calculate_entropy(s: &str) -> f64 {
     if s.is_empty() {
         return 0.0;
     }
 
+    // Candidate tokens are ASCII, where bytes and characters coincide
+    if s.is_ascii() {
+        return byte_entropy(s.as_bytes());
+    }
+
+    // Count symbols and the total length in the same pass
     let mut counts: HashMap<char, usize> = HashMap::new();
+    let mut len = 0usize;
     for ch in s.chars() {
         *counts.entry(ch).or_insert(0) += 1;
+        len += 1;
     }
+    shannon_entropy(counts.into_values(), len)
+}
 
-    let len = s.chars().count() as f64;
+/// Shannon entropy of `bytes` in bits per byte.
+///
+/// Equal to `calculate_entropy` for ASCII text, without the `is_ascii` pre-scan; callers
+/// whose tokens are ASCII by construction can use it directly. Counts go into a fixed
+/// 256-bucket histogram; `u32` buckets keep it at 1 KiB, resident in L1 for the whole loop.
+pub fn byte_entropy(bytes: &[u8]) -> f64 {
+    if bytes.is_empty() {
+        return 0.0;
+    }
+    if bytes.len() > u32::MAX as usize {
+        let mut counts = [0usize; 256];
+        for &b in bytes {
+            counts[b as usize] += 1;
+        }
+        return shannon_entropy(counts.into_iter().filter(|&count| count > 0), bytes.len());
+    }
+    let counts = if bytes.len() >= PRIVATIZED_MIN_LEN {
+        byte_histogram_privatized(bytes)
+    } else {
+        let mut counts = [0u32; 256];
+        for &b in bytes {
+            counts[b as usize] += 1;
+        }
+        counts
+    };
+    shannon_entropy(
+        counts.into_iter().filter(|&count| count > 0).map(|count| count as usize),
+        bytes.len(),
+    )
+}
+
+/// Byte histogram over four private tables, summed at the end.
+///
+/// Runs of the same byte make consecutive increments of one bucket wait on each other;
+/// spreading every 4 bytes over separate tables breaks that store-to-load chain.
+fn byte_histogram_privatized(bytes: &[u8]) -> [u32; 256] {
+    let mut tables = [[0u32; 256]; 4];
+    let mut chunks = bytes.chunks_exact(8);
+    for chunk in &mut chunks {
+        tables[0][chunk[0] as usize] += 1;
+        tables[1][chunk[1] as usize] += 1;
+        tables[2][chunk[2] as usize] += 1;
+        tables[3][chunk[3] as usize] += 1;
+        tables[0][chunk[4] as usize] += 1;
+        tables[1][chunk[5] as usize] += 1;
+        tables[2][chunk[6] as usize] += 1;
+        tables[3][chunk[7] as usize] += 1;
+    }
+    for &b in chunks.remainder() {
+        tables[0][b as usize] += 1;
+    }
+    let mut counts = [0u32; 256];
+    for (idx, count) in counts.iter_mut().enumerate() {
+        *count = tables[0][idx] + tables[1][idx] + tables[2][idx] + tables[3][idx];
+    }
     counts
-        .values()
-        .map(|count| {
-            let p = *count as f64 / len;
-            -(p * p.log2())
-        })
-        .sum()
+}
+
+/// Upper bound on the entropy of any `len`-character string: `log2(len)`, reached when
+/// every character is distinct. Tokens whose bound is below a threshold can skip
+/// `calculate_entropy` entirely.
+pub fn max_entropy(len: usize) -> f64 {
+    log2_count(len)
+}
+
+/// Entropy from symbol counts via `H = log2(n) - Σ c·log2(c) / n`.
+///
+/// Using integer counts instead of probabilities takes one table lookup per symbol and a
+/// single division, instead of a division and a `log2` per symbol.
+fn shannon_entropy(counts: impl Iterator<Item = usize>, len: usize) -> f64 {
+    let mut weighted = 0.0;
+    let mut distinct = 0usize;
+    for count in counts {
+        weighted += count as f64 * log2_count(count);
+        distinct += 1;
+    }
+    if distinct <= 1 {
+        return 0.0;
+    }
+    log2_count(len) - weighted / len as f64
+}
+
+/// `log2(n)` for small counts, read from a table built once.
+fn log2_count(n: usize) -> f64 {
+    static LOG2_TABLE: Lazy<Vec<f64>> = Lazy::new(|| {
+        (0..LOG2_TABLE_SIZE).map(|n| if n == 0 { 0.0 } else { (n as f64).log2() }).collect()
+    });
+    LOG2_TABLE.get(n).copied().unwrap_or_else(|| (n as f64).log2())
 }
 
 #[cfg(test)]
 mod tests {
-    use super::calculate_entropy;
+    use super::{
+        byte_entropy, byte_histogram_privatized, calculate_entropy, max_entropy, PRIVATIZED_MIN_LEN,
+    };
 
     #[test]
     fn entropy_is_zero_for_repeated_chars() {
         assert_eq!(calculate_entropy("aaaaaa"), 0.0);
     }
 
+    #[test]
+    fn entropy_of_empty_string_is_zero() {
+        assert_eq!(calculate_entropy(""), 0.0);
+    }
+
+    #[test]
+    fn entropy_of_two_equal_symbols_is_one_bit() {
+        assert!((calculate_entropy("abab") - 1.0).abs() < 1e-12);
+    }
+
+    #[test]
+    fn entropy_counts_characters_not_bytes() {
+        // Two distinct two-byte characters: 1 bit per character, as for "abab"
+        assert!((calculate_entropy("éüéü") - calculate_entropy("abab")).abs() < 1e-12);
+    }
+
+    #[test]
+    fn entropy_matches_probability_form() {
+        let token = "aB3dE5gH7jK9mN1pQ3sT5vW7yZ9bC2eF4";
+        let len = token.len() as f64;
+        let mut counts = std::collections::HashMap::new();
+        for ch in token.chars() {
+            *counts.entry(ch).or_insert(0usize) += 1;
+        }
+        let expected: f64 = counts
+            .values()
+            .map(|&count| {
+                let p = count as f64 / len;
+                -(p * p.log2())
+            })
+            .sum();
+        assert!((calculate_entropy(token) - expected).abs() < 1e-9);
+    }
+
+    #[test]
+    fn privatized_histogram_matches_simple_count() {
+        let text: String = (0..2_051).map(|i| (b'!' + (i * 7 % 90) as u8) as char).collect();
+        let mut expected = [0u32; 256];
+        for &b in text.as_bytes() {
+            expected[b as usize] += 1;
+        }
+        assert_eq!(byte_histogram_privatized(text.as_bytes()), expected);
+        assert!(text.len() >= PRIVATIZED_MIN_LEN);
+        assert!(calculate_entropy(&text) > 6.0);
+    }
+
+    #[test]
+    fn byte_entropy_matches_calculate_entropy_for_ascii() {
+        for s in ["", "aaaa", "abab", "xK9mP2qR7vL4nW8jT3hY6bF1cZ5", "Zx9_-+/="] {
+            assert_eq!(byte_entropy(s.as_bytes()), calculate_entropy(s));
+        }
+    }
+
+    #[test]
+    fn entropy_never_exceeds_max_entropy() {
+        for s in ["abcdefghijklmnopqrstu", "aaaabbbbccccdddd", "a1b2c3d4", "Zx9_-+/="] {
+            assert!(calculate_entropy(s) <= max_entropy(s.chars().count()));
+        }
+    }
+
     #[test]
     fn entropy_higher_for_mixed_string() {
         assert!(calculate_entropy("a1b2c3d4") > calculate_entropy("aaaaaaaa"));
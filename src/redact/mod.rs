@@ -4,4 +4,4 @@ pub mod entropy;
 pub mod redactor;
 pub mod rules;
 
-pub use redactor::Redactor;
+pub use redactor::{RedactionOutcome, Redactor};
@@ -5,7 +5,9 @@ use serde_json::Value;
 use std::collections::BTreeMap;
 
 pub fn render_jsonl(chunks: &[Chunk]) -> String {
-    let mut lines = Vec::with_capacity(chunks.len());
+    // Serialize every entry straight into one buffer instead of collecting per-line
+    // strings and joining them into a second copy.
+    let mut out: Vec<u8> = Vec::with_capacity(chunks.iter().map(|c| c.content.len() + 128).sum());
     for chunk in chunks {
         let mut tags: Vec<&str> = chunk.tags.iter().map(String::as_str).collect();
         tags.sort();
@@ -28,13 +30,47 @@ pub fn render_jsonl(chunks: &[Chunk]) -> String {
             Value::Array(tags.iter().map(|t| Value::String((*t).to_string())).collect()),
         );
 
-        if let Ok(line) = serde_json::to_string(&entry) {
-            lines.push(line);
+        let line_start = out.len();
+        if serde_json::to_writer(&mut out, &entry).is_ok() {
+            out.push(b'\n');
+        } else {
+            out.truncate(line_start);
         }
     }
-    if lines.is_empty() {
-        String::new()
-    } else {
-        format!("{}\n", lines.join("\n"))
+    String::from_utf8(out).expect("serde_json writes UTF-8")
+}
+
+#[cfg(test)]
+mod tests {
+    use super::render_jsonl;
+    use crate::domain::Chunk;
+    use std::collections::BTreeSet;
+
+    fn chunk(id: &str, content: &str) -> Chunk {
+        Chunk {
+            id: id.to_string(),
+            path: "src/lib.rs".to_string(),
+            language: "rust".to_string(),
+            start_line: 1,
+            end_line: 2,
+            content: content.to_string(),
+            priority: 0.5,
+            tags: BTreeSet::from(["b".to_string(), "a".to_string()]),
+            token_estimate: 1,
+        }
+    }
+
+    #[test]
+    fn renders_one_line_per_chunk_with_trailing_newline() {
+        assert_eq!(render_jsonl(&[]), "");
+
+        let out = render_jsonl(&[chunk("1", "fn a() {}\n"), chunk("2", "fn b() {}\n")]);
+        assert!(out.ends_with("}\n"));
+        let lines: Vec<&str> = out.lines().collect();
+        assert_eq!(lines.len(), 2);
+        let first: serde_json::Value = serde_json::from_str(lines[0]).expect("valid json");
+        assert_eq!(first["id"], "1");
+        assert_eq!(first["content"], "fn a() {}\n");
+        assert_eq!(first["tags"], serde_json::json!(["a", "b"]));
     }
 }
@@ -1,12 +1,16 @@
 //! File scanner implementation with gitignore support
 
 use crate::domain::{FileInfo, ScanStats};
-use crate::utils::{is_binary_file, is_likely_minified, normalize_path};
+use crate::utils::hashing::hex_prefix;
+use crate::utils::{is_binary_sample, is_likely_minified_sample, normalize_path};
 use anyhow::Result;
 use globset::{Glob, GlobSet, GlobSetBuilder};
 use ignore::WalkBuilder;
+use rayon::prelude::*;
 use sha2::{Digest, Sha256};
-use std::collections::BTreeSet;
+use std::collections::{BTreeSet, HashSet};
+use std::fs::File;
+use std::io::Read;
 use std::path::{Path, PathBuf};
 
 const DEFAULT_SAMPLE_SIZE: usize = 8192;
@@ -14,7 +18,8 @@ const DEFAULT_SAMPLE_SIZE: usize = 8192;
 /// File scanner that discovers files in a repository while respecting gitignore rules.
 pub struct FileScanner {
     root_path: PathBuf,
-    include_extensions: Vec<String>,
+    /// Included extensions, lowercased and without the leading dot, for O(1) lookups
+    include_extensions: HashSet<String>,
     exclude_globs: Vec<String>,
     max_file_bytes: u64,
     respect_gitignore: bool,
@@ -29,10 +34,7 @@ impl FileScanner {
     pub fn new(root_path: PathBuf) -> Self {
         Self {
             root_path,
-            include_extensions: crate::domain::default_include_extensions()
-                .iter()
-                .map(|s| s.to_string())
-                .collect(),
+            include_extensions: extension_set(crate::domain::default_include_extensions()),
             exclude_globs: crate::domain::default_exclude_globs()
                 .iter()
                 .map(|s| s.to_string())
@@ -48,7 +50,7 @@ impl FileScanner {
 
     /// Set file extensions to include (e.g., ".rs", ".py")
     pub fn include_extensions(mut self, extensions: Vec<String>) -> Self {
-        self.include_extensions = extensions;
+        self.include_extensions = extension_set(extensions);
         self
     }
 
@@ -94,27 +96,18 @@ impl FileScanner {
 
     /// Check if a file extension should be included
     fn should_include_extension(&self, path: &Path) -> bool {
-        let ext = path.extension().and_then(|e| e.to_str()).unwrap_or("").to_lowercase();
-        let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("").to_lowercase();
-
-        // Handle files without extension but with known names
-        if ext.is_empty() {
-            let known_extensionless = [
-                "makefile",
-                "dockerfile",
-                "rakefile",
-                "gemfile",
-                "procfile",
-                "vagrantfile",
-                "jenkinsfile",
-            ];
-            return known_extensionless.contains(&name.as_str());
+        match path.extension().and_then(|e| e.to_str()).filter(|e| !e.is_empty()) {
+            // Most extensions are already lowercase ASCII and are looked up without a copy
+            Some(ext) if ext.bytes().all(|b| b.is_ascii() && !b.is_ascii_uppercase()) => {
+                self.include_extensions.contains(ext)
+            }
+            Some(ext) => self.include_extensions.contains(ext.to_lowercase().as_str()),
+            // Handle files without extension but with known names
+            None => {
+                let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("");
+                KNOWN_EXTENSIONLESS.iter().any(|known| name.eq_ignore_ascii_case(known))
+            }
         }
-
-        // Add leading dot if not present for comparison
-        let ext_with_dot = if ext.starts_with('.') { ext } else { format!(".{}", ext) };
-
-        self.include_extensions.contains(&ext_with_dot)
     }
 
     /// Scan the repository and return list of FileInfo objects.
@@ -123,7 +116,7 @@ impl FileScanner {
     pub fn scan(&mut self) -> Result<Vec<FileInfo>> {
         self.stats = ScanStats::default();
 
-        let mut files: Vec<(PathBuf, String)> = Vec::new();
+        let mut candidates: Vec<(PathBuf, String, u64, Option<FileIdentity>, bool)> = Vec::new();
         let exclude_globset = self.build_exclude_globset()?;
 
         // Directory filter function matching Python's _walk_files behavior
@@ -163,7 +156,7 @@ impl FileScanner {
                 .filter_entry(dir_filter);
             let mut count = 0usize;
             for entry in raw_builder.build().flatten() {
-                if !entry.path().is_dir() {
+                if !is_dir_entry(&entry) {
                     count += 1;
                 }
             }
@@ -172,7 +165,9 @@ impl FileScanner {
             0
         };
 
-        // Build walker with gitignore support using the `ignore` crate
+        // Build walker with gitignore support using the `ignore` crate. The walker compiles
+        // each directory's .gitignore into a single GlobSet once and shares the parent
+        // matchers with every child, so per-file checks never re-parse or re-walk patterns.
         let mut builder = WalkBuilder::new(&self.root_path);
         builder
             .git_ignore(self.respect_gitignore)
@@ -188,6 +183,9 @@ impl FileScanner {
         // Count files seen after gitignore filtering (before our own filters).
         let mut gitignore_filtered_count = 0usize;
 
+        // Relative paths of directories entered through a symlink, to tell aliases apart
+        let mut symlink_dirs: HashSet<String> = HashSet::new();
+
         // Collect all files
         for entry_result in walker {
             let entry = match entry_result {
@@ -197,8 +195,13 @@ impl FileScanner {
 
             let path = entry.path();
 
-            // Skip directories
-            if path.is_dir() {
+            // Skip directories, remembering the ones reached through a symlink
+            if is_dir_entry(&entry) {
+                if self.follow_symlinks && entry.path_is_symlink() {
+                    if let Ok(rel) = path.strip_prefix(&self.root_path) {
+                        symlink_dirs.insert(normalize_path(rel.to_str().unwrap_or("")));
+                    }
+                }
                 continue;
             }
 
@@ -224,7 +227,7 @@ impl FileScanner {
                 continue;
             }
 
-            // Check file size
+            // Stat once; the size is carried through to FileInfo below
             let metadata = match path.metadata() {
                 Ok(m) => m,
                 Err(_) => continue,
@@ -238,19 +241,28 @@ impl FileScanner {
                 continue;
             }
 
-            // Check if binary
-            if is_binary_file(path, DEFAULT_SAMPLE_SIZE) {
-                self.stats.files_skipped_binary += 1;
-                continue;
-            }
+            let via_symlink = self.follow_symlinks
+                && (entry.path_is_symlink() || is_under_dir(&rel_path, &symlink_dirs));
+            let identity = file_identity(&metadata);
+            candidates.push((path.to_path_buf(), rel_path, size, identity, via_symlink));
+        }
 
-            // Check if minified
-            if self.skip_minified && is_likely_minified(path, self.max_line_length) {
-                self.stats.files_skipped_glob += 1;
-                continue;
+        // Binary and minified checks open and read each candidate, so they run on the rayon
+        // pool once the walk is done. The indexed collect keeps results aligned with
+        // `candidates`, and stats are tallied sequentially afterwards.
+        let (skip_minified, max_line_length) = (self.skip_minified, self.max_line_length);
+        let checks: Vec<ContentCheck> = candidates
+            .par_iter()
+            .map(|(path, ..)| ContentCheck::of(path, skip_minified, max_line_length))
+            .collect();
+
+        let mut files = Vec::with_capacity(candidates.len());
+        for (candidate, check) in candidates.into_iter().zip(checks) {
+            match check {
+                ContentCheck::Binary => self.stats.files_skipped_binary += 1,
+                ContentCheck::Minified => self.stats.files_skipped_glob += 1,
+                ContentCheck::Text => files.push(candidate),
             }
-
-            files.push((path.to_path_buf(), rel_path));
         }
 
         // Derive gitignore-skipped count from the difference between the raw walk
@@ -260,40 +272,53 @@ impl FileScanner {
                 raw_file_count.saturating_sub(gitignore_filtered_count);
         }
 
-        // Sort by relative path for deterministic ordering
-        files.sort_by(|a, b| a.1.cmp(&b.1));
-
-        // Convert to FileInfo objects
-        let mut result = Vec::new();
-        for (path, rel_path) in files {
-            let metadata = match path.metadata() {
-                Ok(m) => m,
-                Err(_) => continue,
-            };
+        // Sort by relative path for deterministic ordering. Relative paths are unique,
+        // so an unstable sort yields the same order without the stable sort's buffer.
+        files.sort_unstable_by(|a, b| a.1.cmp(&b.1));
+
+        // When following symlinks the same file can be reached under several paths. A path
+        // through a symlink is dropped when the file's real path was scanned too, or else when
+        // an earlier alias in sorted order was kept. Hard links are distinct paths and are all
+        // kept. Directory cycles are already cut by the walker.
+        if self.follow_symlinks {
+            let real: HashSet<FileIdentity> =
+                files.iter().filter(|file| !file.4).filter_map(|file| file.3).collect();
+            let mut kept_aliases = HashSet::new();
+            let before = files.len();
+            files.retain(|&(.., identity, via_symlink)| match identity {
+                Some(identity) if via_symlink => {
+                    !real.contains(&identity) && kept_aliases.insert(identity)
+                }
+                _ => true,
+            });
+            self.stats.files_skipped_symlink = before - files.len();
+        }
 
-            let size = metadata.len();
-            let ext = path.extension().and_then(|e| e.to_str()).unwrap_or("").to_lowercase();
-            let ext_with_dot =
-                if !ext.is_empty() && !ext.starts_with('.') { format!(".{}", ext) } else { ext };
+        // Convert to FileInfo objects, moving the collected paths rather than cloning them
+        let mut result = Vec::with_capacity(files.len());
+        for (path, rel_path, size, ..) in files {
+            let ext_with_dot = dotted_extension(&path);
 
             let filename = path.file_name().and_then(|n| n.to_str()).unwrap_or("");
             let language = crate::domain::get_language(&ext_with_dot, filename);
 
             // Generate stable ID: SHA-256 of relative path, first 16 hex chars (matches Python)
-            let id = {
-                let hash = Sha256::digest(rel_path.as_bytes());
-                format!("{:x}", hash)[..16].to_string()
-            };
+            let id = hex_prefix(&Sha256::digest(rel_path.as_bytes())[..8]);
 
-            // Update language stats
-            *self.stats.languages_detected.entry(language.clone()).or_insert(0) += 1;
+            // Update language stats; the key is only allocated for a newly seen language
+            match self.stats.languages_detected.get_mut(language) {
+                Some(count) => *count += 1,
+                None => {
+                    self.stats.languages_detected.insert(language.to_string(), 1);
+                }
+            }
 
             let file_info = FileInfo {
-                path: path.clone(),
-                relative_path: rel_path.clone(),
+                path,
+                relative_path: rel_path,
                 size_bytes: size,
                 extension: ext_with_dot,
-                language: language.clone(),
+                language: language.to_string(),
                 id,
                 priority: 0.5,         // Default priority, will be set by ranker
                 token_estimate: 0,     // Will be calculated later
@@ -313,7 +338,8 @@ impl FileScanner {
             + self.stats.files_skipped_binary
             + self.stats.files_skipped_extension
             + self.stats.files_skipped_gitignore
-            + self.stats.files_skipped_glob;
+            + self.stats.files_skipped_glob
+            + self.stats.files_skipped_symlink;
 
         Ok(result)
     }
@@ -324,6 +350,97 @@ impl FileScanner {
     }
 }
 
+/// Extensionless filenames that are always scanned.
+const KNOWN_EXTENSIONLESS: &[&str] =
+    &["makefile", "dockerfile", "rakefile", "gemfile", "procfile", "vagrantfile", "jenkinsfile"];
+
+/// The extension as stored on `FileInfo`: lowercased with a leading dot, or empty.
+/// Built in one allocation; ASCII extensions are lowercased in place.
+fn dotted_extension(path: &Path) -> String {
+    let ext = path.extension().and_then(|e| e.to_str()).unwrap_or("");
+    if ext.is_empty() {
+        return String::new();
+    }
+    let mut dotted = String::with_capacity(ext.len() + 1);
+    dotted.push('.');
+    if ext.is_ascii() {
+        dotted.push_str(ext);
+        dotted.make_ascii_lowercase();
+    } else {
+        dotted.push_str(&ext.to_lowercase());
+    }
+    dotted
+}
+
+/// Normalize configured extensions (".rs", "rs", ".RS") into the scanner's lookup set.
+fn extension_set(extensions: impl IntoIterator<Item = String>) -> HashSet<String> {
+    extensions
+        .into_iter()
+        .map(|ext| ext.trim_start_matches('.').to_lowercase())
+        .filter(|ext| !ext.is_empty())
+        .collect()
+}
+
+/// Outcome of the content-based filters applied to a scan candidate.
+enum ContentCheck {
+    Binary,
+    Minified,
+    Text,
+}
+
+impl ContentCheck {
+    /// Open and read each candidate once; both checks work on the same sample.
+    fn of(path: &Path, skip_minified: bool, max_line_length: usize) -> Self {
+        let sample_size = if skip_minified {
+            DEFAULT_SAMPLE_SIZE.max(max_line_length + 1)
+        } else {
+            DEFAULT_SAMPLE_SIZE
+        };
+        let mut sample = Vec::with_capacity(sample_size);
+        let sampled = File::open(path)
+            .and_then(|file| file.take(sample_size as u64).read_to_end(&mut sample));
+
+        // Unreadable files count as binary, as in `is_binary_file`
+        if sampled.is_err() || is_binary_sample(&sample[..sample.len().min(DEFAULT_SAMPLE_SIZE)]) {
+            ContentCheck::Binary
+        } else if skip_minified && is_likely_minified_sample(path, &sample, max_line_length) {
+            ContentCheck::Minified
+        } else {
+            ContentCheck::Text
+        }
+    }
+}
+
+/// Whether any parent directory of `rel_path` is one of `dirs`.
+fn is_under_dir(rel_path: &str, dirs: &HashSet<String>) -> bool {
+    !dirs.is_empty() && rel_path.match_indices('/').any(|(end, _)| dirs.contains(&rel_path[..end]))
+}
+
+/// Filesystem identity of a file: `(device, inode)`.
+type FileIdentity = (u64, u64);
+
+#[cfg(unix)]
+fn file_identity(metadata: &std::fs::Metadata) -> Option<FileIdentity> {
+    use std::os::unix::fs::MetadataExt;
+    Some((metadata.dev(), metadata.ino()))
+}
+
+#[cfg(not(unix))]
+fn file_identity(_metadata: &std::fs::Metadata) -> Option<FileIdentity> {
+    None
+}
+
+/// Check whether a walk entry is a directory.
+///
+/// Uses the file type cached on the entry by the walker and only falls back to a
+/// `stat` for symlinks, whose target type is not known from the directory listing.
+fn is_dir_entry(entry: &ignore::DirEntry) -> bool {
+    match entry.file_type() {
+        Some(file_type) if !file_type.is_symlink() => file_type.is_dir(),
+        _ => entry.path().is_dir(),
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -482,4 +599,112 @@ mod tests {
         // files_included = only the .rs ones
         assert_eq!(stats.files_included, 3, "files_included should be 3");
     }
+
+    #[cfg(unix)]
+    #[test]
+    fn test_broken_symlink_skipped() {
+        let temp_dir = TempDir::new().unwrap();
+        let root = temp_dir.path();
+
+        fs::write(root.join("main.py"), "print('hello')").unwrap();
+        std::os::unix::fs::symlink(root.join("missing.py"), root.join("dangling.py")).unwrap();
+
+        let mut scanner = FileScanner::new(root.to_path_buf()).respect_gitignore(false);
+        let files = scanner.scan().unwrap();
+
+        let paths: Vec<&str> = files.iter().map(|f| f.relative_path.as_str()).collect();
+        assert_eq!(paths, vec!["main.py"]);
+        assert_eq!(files[0].size_bytes, "print('hello')".len() as u64);
+    }
+
+    #[test]
+    fn test_nested_gitignore_rules() {
+        let temp_dir = TempDir::new().unwrap();
+        let root = temp_dir.path();
+
+        // Gitignore rules only apply inside a git repository
+        fs::create_dir_all(root.join(".git")).unwrap();
+        fs::write(root.join(".gitignore"), "build/\n**/gen_*.py\n").unwrap();
+        fs::create_dir_all(root.join("build")).unwrap();
+        fs::write(root.join("build/out.py"), "# build output").unwrap();
+        fs::create_dir_all(root.join("src/deep")).unwrap();
+        fs::write(root.join("src/.gitignore"), "local.py\n").unwrap();
+        fs::write(root.join("src/gen_a.py"), "# generated").unwrap();
+        fs::write(root.join("src/deep/gen_b.py"), "# generated").unwrap();
+        fs::write(root.join("src/local.py"), "# local only").unwrap();
+        fs::write(root.join("src/keep.py"), "# kept").unwrap();
+        fs::write(root.join("main.py"), "print('hello')").unwrap();
+
+        let mut scanner =
+            FileScanner::new(root.to_path_buf()).include_extensions(vec![".py".to_string()]);
+        let files = scanner.scan().unwrap();
+
+        let paths: Vec<&str> = files.iter().map(|f| f.relative_path.as_str()).collect();
+        assert_eq!(paths, vec!["main.py", "src/keep.py"]);
+        assert_eq!(scanner.stats().files_skipped_gitignore, 4);
+    }
+
+    #[cfg(unix)]
+    #[test]
+    fn test_follow_symlinks_dedupes_aliases_and_cycles() {
+        let temp_dir = TempDir::new().unwrap();
+        let root = temp_dir.path();
+
+        fs::create_dir_all(root.join("src")).unwrap();
+        fs::write(root.join("src/main.py"), "print('hello')").unwrap();
+        std::os::unix::fs::symlink(root.join("src"), root.join("alias")).unwrap();
+        std::os::unix::fs::symlink(root, root.join("src/loop")).unwrap();
+
+        let mut scanner =
+            FileScanner::new(root.to_path_buf()).respect_gitignore(false).follow_symlinks(true);
+        let files = scanner.scan().unwrap();
+
+        let paths: Vec<&str> = files.iter().map(|f| f.relative_path.as_str()).collect();
+        assert_eq!(paths, vec!["src/main.py"]);
+        assert_eq!(scanner.stats().files_skipped_symlink, 1);
+        assert_eq!(
+            scanner.stats().files_scanned,
+            scanner.stats().files_included + scanner.stats().files_skipped
+        );
+    }
+
+    #[cfg(unix)]
+    #[test]
+    fn test_follow_symlinks_keeps_hard_links() {
+        let temp_dir = TempDir::new().unwrap();
+        let root = temp_dir.path();
+
+        fs::write(root.join("a.py"), "print('hello')").unwrap();
+        fs::hard_link(root.join("a.py"), root.join("b.py")).unwrap();
+
+        let mut scanner =
+            FileScanner::new(root.to_path_buf()).respect_gitignore(false).follow_symlinks(true);
+        let files = scanner.scan().unwrap();
+
+        let paths: Vec<&str> = files.iter().map(|f| f.relative_path.as_str()).collect();
+        assert_eq!(paths, vec!["a.py", "b.py"]);
+        assert_eq!(scanner.stats().files_skipped_symlink, 0);
+    }
+
+    #[test]
+    fn test_rooted_and_negated_gitignore_rules() {
+        let temp_dir = TempDir::new().unwrap();
+        let root = temp_dir.path();
+
+        fs::create_dir_all(root.join(".git")).unwrap();
+        fs::write(root.join(".gitignore"), "/local.py\n*_gen.py\n!keep_gen.py\n").unwrap();
+        fs::create_dir_all(root.join("pkg")).unwrap();
+        fs::write(root.join("local.py"), "# root only").unwrap();
+        fs::write(root.join("pkg/local.py"), "# nested, not rooted").unwrap();
+        fs::write(root.join("pkg/api_gen.py"), "# generated").unwrap();
+        fs::write(root.join("pkg/keep_gen.py"), "# re-included").unwrap();
+
+        let mut scanner =
+            FileScanner::new(root.to_path_buf()).include_extensions(vec![".py".to_string()]);
+        let files = scanner.scan().unwrap();
+
+        let paths: Vec<&str> = files.iter().map(|f| f.relative_path.as_str()).collect();
+        assert_eq!(paths, vec!["pkg/keep_gen.py", "pkg/local.py"]);
+        assert_eq!(scanner.stats().files_skipped_gitignore, 2);
+    }
 }
@@ -6,20 +6,33 @@ use std::fs::File;
 use std::io::Read;
 use std::path::Path;
 
-/// Common patterns indicating generated files
-static GENERATED_PATTERNS: Lazy<Vec<Regex>> = Lazy::new(|| {
-    vec![
-        Regex::new(r"(?i)generated").unwrap(),
-        Regex::new(r"(?i)auto-generated").unwrap(),
-        Regex::new(r"(?i)do not edit").unwrap(),
-        Regex::new(r"(?i)machine generated").unwrap(),
-    ]
-});
-
-const MINIFIED_INDICATORS: &[&str] = &[".min.", ".bundle.", ".packed."];
+/// Markers indicating generated files. "generated" also covers "auto-generated" and
+/// "machine generated", so one alternation stands in for the full marker list.
+static GENERATED_MARKERS: Lazy<Regex> =
+    Lazy::new(|| Regex::new(r"(?i)generated|do not edit").unwrap());
+
+/// Directory names that mark generated code when followed by a path separator.
+const GENERATED_DIRS: &[&str] = &["generated", "gen", "auto", "build"];
+
+/// Characters of the content sample searched for generated markers
+const GENERATED_MARKER_WINDOW: usize = 2000;
+
+const MINIFIED_INDICATORS: &[&str] = &[".min.", "-min.", ".bundle.", ".packed."];
+
+/// Extensions whose minified form keeps some newlines, so the average line length is checked
+const MINIFIABLE_EXTENSIONS: &[&str] = &["js", "mjs", "cjs", "css", "json"];
+
+/// Average line length above which a minifiable file is treated as minified
+const MINIFIED_AVG_LINE_LENGTH: usize = 200;
+
+/// Smallest sample for which the average line length is meaningful
+const MIN_AVG_SAMPLE_BYTES: usize = 1024;
 
 /// Check if a file appears to be minified based on filename or line length.
 ///
+/// A file is minified if its first line exceeds `max_line_length`, or, for JS/CSS/JSON,
+/// if the average length of the complete lines in the sample exceeds 200 bytes.
+///
 /// # Arguments
 /// * `path` - Path to the file
 /// * `max_line_length` - Threshold line length (default: 5000 chars)
@@ -29,32 +42,55 @@ const MINIFIED_INDICATORS: &[&str] = &[".min.", ".bundle.", ".packed."];
 pub fn is_likely_minified(path: &Path, max_line_length: usize) -> bool {
     let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("").to_lowercase();
 
-    // Check filename indicators first (fast path)
-    for indicator in MINIFIED_INDICATORS {
-        if name.contains(indicator) {
-            return true;
-        }
+    // Check filename indicators first (fast path); a match never opens the file
+    if has_minified_name(&name) {
+        return true;
     }
 
-    // Check first line length
-    if let Ok(mut file) = File::open(path) {
-        let mut buffer = vec![0u8; max_line_length + 1];
-        if let Ok(bytes_read) = file.read(&mut buffer) {
-            if bytes_read == 0 {
-                return false;
-            }
+    // Sample just past the line-length threshold; everything below works on this buffer
+    let mut buffer = Vec::with_capacity(max_line_length + 1);
+    let sampled = File::open(path)
+        .and_then(|file| file.take(max_line_length as u64 + 1).read_to_end(&mut buffer));
+    sampled.is_ok() && is_minified_content(&name, &buffer, max_line_length)
+}
 
-            // Find first newline
-            if let Some(newline_pos) = buffer[..bytes_read].iter().position(|&b| b == b'\n') {
-                return newline_pos > max_line_length;
-            }
+/// Apply the [`is_likely_minified`] heuristics to a sample already read from the file.
+///
+/// Only the first `max_line_length + 1` bytes of `sample` are considered, so a larger
+/// sample shared with other checks gives the same verdict as reading the file directly.
+pub fn is_likely_minified_sample(path: &Path, sample: &[u8], max_line_length: usize) -> bool {
+    let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("").to_lowercase();
+    let sample = &sample[..sample.len().min(max_line_length + 1)];
+    has_minified_name(&name) || is_minified_content(&name, sample, max_line_length)
+}
 
-            // No newline found - if we read the full buffer, line is too long
-            return bytes_read > max_line_length;
-        }
+fn has_minified_name(name: &str) -> bool {
+    MINIFIED_INDICATORS.iter().any(|indicator| name.contains(indicator)) || name.ends_with(".map")
+}
+
+fn is_minified_content(name: &str, buffer: &[u8], max_line_length: usize) -> bool {
+    if buffer.is_empty() {
+        return false;
     }
 
-    false
+    // Check first line length
+    let Some(first_newline) = buffer.iter().position(|&b| b == b'\n') else {
+        // No newline found - if we read the full buffer, line is too long
+        return buffer.len() > max_line_length;
+    };
+    if first_newline > max_line_length {
+        return true;
+    }
+
+    let ext = name.rsplit_once('.').map_or("", |(_, ext)| ext);
+    if buffer.len() < MIN_AVG_SAMPLE_BYTES || !MINIFIABLE_EXTENSIONS.contains(&ext) {
+        return false;
+    }
+
+    // Average over complete lines only, so a truncated last line does not skew the result
+    let complete = buffer.iter().rposition(|&b| b == b'\n').map_or(0, |pos| pos + 1);
+    let lines = buffer[..complete].iter().filter(|&&b| b == b'\n').count();
+    (complete - lines) / lines > MINIFIED_AVG_LINE_LENGTH
 }
 
 /// Check if a file appears to be generated or auto-generated.
@@ -78,22 +114,20 @@ pub fn is_likely_generated(path: &Path, content_sample: &str) -> bool {
     }
 
     // Check common generated directories
-    let path_str = path.to_str().unwrap_or("").to_lowercase();
-    let path_normalized = path_str.replace('\\', "/");
-    for dir in ["generated/", "gen/", "auto/", "build/"] {
-        if path_normalized.contains(dir) {
-            return true;
-        }
+    if path.to_str().is_some_and(|path_str| has_dir_before_separator(path_str, GENERATED_DIRS)) {
+        return true;
     }
 
     // Check content for generated markers
     if !content_sample.is_empty() {
-        let sample_lower = content_sample.chars().take(2000).collect::<String>().to_lowercase();
-
-        for pattern in GENERATED_PATTERNS.iter() {
-            if pattern.is_match(&sample_lower) {
-                return true;
-            }
+        // The case-insensitive search runs over the sample's first characters in place,
+        // without copying or lowercasing them first.
+        let window_end = content_sample
+            .char_indices()
+            .nth(GENERATED_MARKER_WINDOW)
+            .map_or(content_sample.len(), |(end, _)| end);
+        if GENERATED_MARKERS.is_match(&content_sample[..window_end]) {
+            return true;
         }
 
         // Check for extremely long first line (common in minified files)
@@ -115,22 +149,35 @@ pub fn is_likely_generated(path: &Path, content_sample: &str) -> bool {
 /// # Returns
 /// `true` if the filename matches a known lock file
 pub fn is_lock_file(path: &Path) -> bool {
-    let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("").to_lowercase();
-
-    matches!(
-        name.as_str(),
-        "package-lock.json"
-            | "yarn.lock"
-            | "pnpm-lock.yaml"
-            | "poetry.lock"
-            | "pipfile.lock"
-            | "cargo.lock"
-            | "gemfile.lock"
-            | "composer.lock"
-            | "go.sum"
-    )
+    let name = path.file_name().and_then(|n| n.to_str()).unwrap_or("");
+    LOCK_FILES.iter().any(|lock| name.eq_ignore_ascii_case(lock))
 }
 
+/// Known dependency lock file names, compared ignoring ASCII case.
+const LOCK_FILES: &[&str] = &[
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "poetry.lock",
+    "pipfile.lock",
+    "cargo.lock",
+    "gemfile.lock",
+    "composer.lock",
+    "go.sum",
+];
+
+/// Directory names that mark vendored code when followed by a path separator.
+const VENDOR_DIRS: &[&str] = &[
+    "vendor",
+    "vendors",
+    "third_party",
+    "third-party",
+    "thirdparty",
+    "external",
+    "extern",
+    "node_modules",
+];
+
 /// Check if a file likely belongs to vendored/third-party code.
 ///
 /// # Arguments
@@ -139,25 +186,22 @@ pub fn is_lock_file(path: &Path) -> bool {
 /// # Returns
 /// `true` if the path contains a known vendor directory segment
 pub fn is_vendored(path: &Path) -> bool {
-    let path_str = path.to_str().unwrap_or("").to_lowercase();
-    let path_normalized = path_str.replace('\\', "/");
-
-    for vendor_dir in [
-        "vendor/",
-        "vendors/",
-        "third_party/",
-        "third-party/",
-        "thirdparty/",
-        "external/",
-        "extern/",
-        "node_modules/",
-    ] {
-        if path_normalized.contains(vendor_dir) {
-            return true;
-        }
-    }
+    path.to_str().is_some_and(|path_str| has_dir_before_separator(path_str, VENDOR_DIRS))
+}
 
-    false
+/// Check whether any of `dirs` directly precedes a path separator, ignoring ASCII case.
+///
+/// One walk over the separators replaces a lowercased copy, a separator-rewritten copy and
+/// a substring search per name. Names match as suffixes, so `myvendor/` counts as `vendor/`.
+fn has_dir_before_separator(path_str: &str, dirs: &[&str]) -> bool {
+    let bytes = path_str.as_bytes();
+    bytes.iter().enumerate().filter(|&(_, &b)| b == b'/' || b == b'\\').any(|(end, _)| {
+        let before = &bytes[..end];
+        dirs.iter().any(|dir| {
+            before.len() >= dir.len()
+                && before[before.len() - dir.len()..].eq_ignore_ascii_case(dir.as_bytes())
+        })
+    })
 }
 
 #[cfg(test)]
@@ -170,6 +214,8 @@ mod tests {
     fn test_is_likely_minified_by_name() {
         assert!(is_likely_minified(Path::new("bundle.min.js"), 5000));
         assert!(is_likely_minified(Path::new("app.bundle.js"), 5000));
+        assert!(is_likely_minified(Path::new("jquery-min.js"), 5000));
+        assert!(is_likely_minified(Path::new("app.js.map"), 5000));
         assert!(!is_likely_minified(Path::new("app.js"), 5000));
     }
 
@@ -184,11 +230,44 @@ mod tests {
         assert!(is_likely_minified(file.path(), 5000));
     }
 
+    #[test]
+    fn test_is_likely_minified_by_average_line_length() {
+        let dense = "var a=1;".repeat(40) + "\n";
+        let mut minified = tempfile::Builder::new().suffix(".js").tempfile().unwrap();
+        minified.write_all(dense.repeat(12).as_bytes()).unwrap();
+        minified.flush().unwrap();
+        assert!(is_likely_minified(minified.path(), 5000));
+
+        // Same content outside the minifiable extensions keeps the first-line rule only
+        let mut text = tempfile::Builder::new().suffix(".md").tempfile().unwrap();
+        text.write_all(dense.repeat(12).as_bytes()).unwrap();
+        text.flush().unwrap();
+        assert!(!is_likely_minified(text.path(), 5000));
+
+        let mut source = tempfile::Builder::new().suffix(".js").tempfile().unwrap();
+        source.write_all("const value = compute(input);\n".repeat(100).as_bytes()).unwrap();
+        source.flush().unwrap();
+        assert!(!is_likely_minified(source.path(), 5000));
+    }
+
+    #[test]
+    fn test_is_likely_minified_sample_matches_file_check() {
+        let long_line = vec![b'a'; 6000];
+        assert!(is_likely_minified_sample(Path::new("app.js"), &long_line, 5000));
+        assert!(is_likely_minified_sample(Path::new("app.min.js"), b"", 5000));
+
+        // Bytes past max_line_length + 1 are ignored, as they are never read from disk
+        let mut sample = b"short\n".to_vec();
+        sample.extend_from_slice(&long_line);
+        assert!(!is_likely_minified_sample(Path::new("notes.txt"), &sample, 5000));
+    }
+
     #[test]
     fn test_is_lock_file() {
         assert!(is_lock_file(Path::new("package-lock.json")));
         assert!(is_lock_file(Path::new("yarn.lock")));
         assert!(is_lock_file(Path::new("Cargo.lock")));
+        assert!(is_lock_file(Path::new("frontend/PNPM-LOCK.YAML")));
         assert!(!is_lock_file(Path::new("package.json")));
     }
 
@@ -198,6 +277,12 @@ mod tests {
         assert!(is_vendored(Path::new("node_modules/react/index.js")));
         assert!(is_vendored(Path::new("third_party/lib.c")));
         assert!(!is_vendored(Path::new("src/main.rs")));
+        // Case and separator insensitive, and matched as a name suffix like before
+        assert!(is_vendored(Path::new("Vendor/foo.js")));
+        assert!(is_vendored(Path::new("lib\\Node_Modules\\x.js")));
+        assert!(is_vendored(Path::new("src/myvendor/x.go")));
+        assert!(!is_vendored(Path::new("src/vendor.rs")));
+        assert!(!is_vendored(Path::new("external_api/x.py")));
     }
 
     #[test]
@@ -208,5 +293,10 @@ mod tests {
             "// This file is auto-generated. Do not edit."
         ));
         assert!(!is_likely_generated(Path::new("src/main.rs"), "fn main() {}"));
+        assert!(is_likely_generated(Path::new("out\\Build\\app.js"), ""));
+        assert!(is_likely_generated(Path::new("src/api.rs"), "// @Generated by protoc"));
+        // Markers past the first 2000 characters are not searched
+        let late_marker = format!("{}// DO NOT EDIT", "é\n".repeat(1000));
+        assert!(!is_likely_generated(Path::new("src/api.rs"), &late_marker));
     }
 }
@@ -35,45 +35,66 @@ pub fn detect_encoding(path: &Path, sample_size: usize) -> String {
 }
 
 fn detect_encoding_impl(path: &Path, sample_size: usize) -> Result<String> {
-    let mut file = File::open(path)?;
-    let mut sample = vec![0u8; sample_size];
-    let bytes_read = file.read(&mut sample)?;
-    sample.truncate(bytes_read);
+    let mut sample = Vec::with_capacity(sample_size.min(DEFAULT_SAMPLE_SIZE));
+    File::open(path)?.take(sample_size as u64).read_to_end(&mut sample)?;
+    Ok(detect_sample_encoding(&sample))
+}
 
+/// Detect the encoding of an in-memory sample; see [`detect_encoding`] for the strategy.
+fn detect_sample_encoding(sample: &[u8]) -> String {
     if sample.is_empty() {
-        return Ok("utf-8".to_string());
+        return "utf-8".to_string();
     }
 
     // Check for BOM markers first (most reliable)
-    if sample.len() >= 3 && sample.starts_with(&[0xef, 0xbb, 0xbf]) {
-        return Ok("utf-8-sig".to_string());
-    }
-    if sample.len() >= 2 && sample.starts_with(&[0xff, 0xfe]) {
-        return Ok("utf-16-le".to_string());
-    }
-    if sample.len() >= 2 && sample.starts_with(&[0xfe, 0xff]) {
-        return Ok("utf-16-be".to_string());
+    if let Some(label) = bom_encoding(sample) {
+        return label.to_string();
     }
 
-    // Try UTF-8 first (fast path) - most source files are UTF-8
-    if std::str::from_utf8(&sample).is_ok() {
-        return Ok("utf-8".to_string());
+    // Pure ASCII and valid UTF-8 are settled without statistical detection
+    if is_utf8_sample(sample) {
+        return "utf-8".to_string();
     }
 
     // Fall back to chardetng for non-UTF-8 files
     let mut detector = EncodingDetector::new();
-    detector.feed(&sample, true);
+    detector.feed(sample, true);
     let encoding = detector.guess(None, true);
 
     // Normalize encoding name to match Python behavior
     let name = encoding.name().to_lowercase();
     if name == "windows-1252" || name == "iso-8859-1" {
         // chardetng may detect these, keep as-is
-        Ok(name)
+        name
     } else if name.contains("utf-8") || name == "ascii" {
-        Ok("utf-8".to_string())
+        "utf-8".to_string()
+    } else {
+        name
+    }
+}
+
+/// Map a leading byte-order mark to its normalized encoding label.
+fn bom_encoding(sample: &[u8]) -> Option<&'static str> {
+    if sample.starts_with(&[0xef, 0xbb, 0xbf]) {
+        Some("utf-8-sig")
+    } else if sample.starts_with(&[0xff, 0xfe]) {
+        Some("utf-16-le")
+    } else if sample.starts_with(&[0xfe, 0xff]) {
+        Some("utf-16-be")
     } else {
-        Ok(name)
+        None
+    }
+}
+
+/// Check whether a sample is UTF-8, tolerating a code point cut off at the sample boundary.
+fn is_utf8_sample(sample: &[u8]) -> bool {
+    if sample.is_ascii() {
+        return true;
+    }
+    match std::str::from_utf8(sample) {
+        Ok(_) => true,
+        // `error_len() == None` means the input ended mid-sequence, not that it is invalid
+        Err(err) => err.error_len().is_none() && sample.len() - err.valid_up_to() < 4,
     }
 }
 
@@ -94,32 +115,43 @@ pub fn is_binary_file(path: &Path, sample_size: usize) -> bool {
 }
 
 fn is_binary_file_impl(path: &Path, sample_size: usize) -> Result<bool> {
-    let mut file = File::open(path)?;
-    let mut sample = vec![0u8; sample_size];
-    let bytes_read = file.read(&mut sample)?;
-    sample.truncate(bytes_read);
+    let mut sample = Vec::with_capacity(sample_size.min(DEFAULT_SAMPLE_SIZE));
+    File::open(path)?.take(sample_size as u64).read_to_end(&mut sample)?;
+    Ok(is_binary_sample(&sample))
+}
 
+/// Apply the [`is_binary_file`] heuristics to a sample already read from the file.
+pub fn is_binary_sample(sample: &[u8]) -> bool {
     if sample.is_empty() {
-        return Ok(false);
+        return false;
     }
 
     // Check for null bytes (strong indicator of binary)
     if sample.contains(&0) {
-        return Ok(true);
+        return true;
     }
 
     // Check for high ratio of non-text bytes
     // Text files typically have >70% printable ASCII
-    let printable_count = sample
-        .iter()
-        .filter(|&&b| {
-            (32..=126).contains(&b) || b == 9 || b == 10 || b == 13 // printable + tab, LF, CR
-        })
-        .count();
+    let printable_count = sample.iter().map(|&b| TEXT_BYTES[b as usize] as usize).sum::<usize>();
 
-    Ok((printable_count as f64 / sample.len() as f64) < 0.70)
+    (printable_count as f64 / sample.len() as f64) < 0.70
 }
 
+/// Lookup table of bytes counted as text: printable ASCII plus tab, LF and CR.
+static TEXT_BYTES: [bool; 256] = {
+    let mut table = [false; 256];
+    let mut b = 32;
+    while b <= 126 {
+        table[b] = true;
+        b += 1;
+    }
+    table[b'\t' as usize] = true;
+    table[b'\n' as usize] = true;
+    table[b'\r' as usize] = true;
+    table
+};
+
 /// Read a file safely with encoding detection and error handling.
 ///
 /// Strategy (matching Python implementation):
@@ -128,6 +160,10 @@ fn is_binary_file_impl(path: &Path, sample_size: usize) -> Result<bool> {
 /// 3. If UTF-8 fails, detect encoding and retry with replacement
 /// 4. Last resort: UTF-8 with replacement characters
 ///
+/// The file is read once; every step works on that buffer, and valid UTF-8 is
+/// turned into the returned `String` without copying. With `max_bytes` set, only
+/// the prefix that can hold that many characters is read from disk.
+///
 /// # Arguments
 /// * `path` - Path to the file to read
 /// * `max_bytes` - Optional maximum number of bytes to read
@@ -140,73 +176,67 @@ pub fn read_file_safe(
     max_bytes: Option<usize>,
     encoding: Option<&str>,
 ) -> Result<(String, String)> {
-    // If encoding specified, use it directly
-    if let Some(enc_name) = encoding {
-        if let Some((content, used_enc)) = try_read_with_encoding(path, max_bytes, enc_name) {
-            return Ok((content, used_enc));
-        }
-        // Fall through to auto-detect if specified encoding fails
-    }
+    let bytes = read_prefix(path, max_bytes)
+        .with_context(|| format!("Failed to read file: {}", path.display()))?;
+    let (mut content, used_enc) = decode_file_bytes(bytes, encoding);
 
-    // Try UTF-8 first (strict mode to detect issues)
-    match try_read_utf8_strict(path, max_bytes) {
-        Ok(content) => return Ok((content, "utf-8".to_string())),
-        Err(_) => {
-            // UTF-8 failed, continue to detection
+    if let Some(limit) = max_bytes {
+        if let Some((end, _)) = content.char_indices().nth(limit) {
+            content.truncate(end);
         }
     }
 
-    // Fall back to encoding detection
-    let detected = detect_encoding(path, DEFAULT_SAMPLE_SIZE);
-    if let Some((content, used_enc)) = try_read_with_encoding(path, max_bytes, &detected) {
-        return Ok((content, used_enc));
-    }
-
-    // Last resort: UTF-8 with replacement
-    let content = std::fs::read_to_string(path)
-        .or_else(|_| {
-            let bytes = std::fs::read(path)?;
-            let (cow, _, _) = UTF_8.decode(&bytes);
-            Ok::<_, std::io::Error>(cow.into_owned())
-        })
-        .with_context(|| format!("Failed to read file: {}", path.display()))?;
-
-    Ok((content, "utf-8".to_string()))
+    Ok((content, used_enc))
 }
 
-fn try_read_utf8_strict(path: &Path, max_bytes: Option<usize>) -> Result<String> {
-    let bytes = std::fs::read(path)?;
-    let content = std::str::from_utf8(&bytes).context("Not valid UTF-8")?.to_string();
+/// Read the whole file, or for a character limit just enough bytes to decode it.
+///
+/// No supported encoding needs more than 4 bytes per character, and the prefix is never
+/// shorter than the detection sample, so detection sees the same bytes as a full read.
+/// A UTF-8 sequence cut off by the bound is dropped so the strict UTF-8 check still holds.
+fn read_prefix(path: &Path, max_chars: Option<usize>) -> std::io::Result<Vec<u8>> {
+    let Some(limit) = max_chars else {
+        return std::fs::read(path);
+    };
 
-    if let Some(limit) = max_bytes {
-        Ok(content.chars().take(limit).collect())
-    } else {
-        Ok(content)
+    let cap = limit.saturating_mul(4).max(DEFAULT_SAMPLE_SIZE) as u64;
+    let file = File::open(path)?;
+    let len = file.metadata()?.len();
+    let mut bytes = Vec::with_capacity(len.min(cap) as usize);
+    file.take(cap).read_to_end(&mut bytes)?;
+
+    if len > cap {
+        if let Err(err) = std::str::from_utf8(&bytes) {
+            if err.error_len().is_none() {
+                bytes.truncate(err.valid_up_to());
+            }
+        }
     }
+    Ok(bytes)
 }
 
-fn try_read_with_encoding(
-    path: &Path,
-    max_bytes: Option<usize>,
-    encoding_name: &str,
-) -> Option<(String, String)> {
-    // Try to find the encoding
-    let encoding = Encoding::for_label(encoding_name.as_bytes())?;
-
-    // Read the file bytes
-    let bytes = std::fs::read(path).ok()?;
-
-    // Decode with replacement for invalid sequences
-    let (decoded, _encoding_used, _had_errors) = encoding.decode(&bytes);
+fn decode_file_bytes(bytes: Vec<u8>, encoding: Option<&str>) -> (String, String) {
+    // If encoding specified, use it directly; unknown labels fall through to auto-detect
+    if let Some(encoding) = encoding.and_then(|label| Encoding::for_label(label.as_bytes())) {
+        return decode_with(encoding, &bytes);
+    }
 
-    let content = if let Some(limit) = max_bytes {
-        decoded.chars().take(limit).collect()
-    } else {
-        decoded.into_owned()
+    // Try UTF-8 first (strict mode to detect issues); on success the buffer is reused
+    let bytes = match String::from_utf8(bytes) {
+        Ok(content) => return (content, "utf-8".to_string()),
+        Err(err) => err.into_bytes(),
     };
 
-    // Return the content and the encoding name
-    Some((content, encoding.name().to_lowercase()))
+    // Fall back to encoding detection, with UTF-8 replacement as the last resort
+    let sample = &bytes[..bytes.len().min(DEFAULT_SAMPLE_SIZE)];
+    let detected = detect_sample_encoding(sample);
+    decode_with(Encoding::for_label(detected.as_bytes()).unwrap_or(UTF_8), &bytes)
+}
+
+fn decode_with(encoding: &'static Encoding, bytes: &[u8]) -> (String, String) {
+    // Decode with replacement for invalid sequences
+    let (decoded, _encoding_used, _had_errors) = encoding.decode(bytes);
+    (decoded.into_owned(), encoding.name().to_lowercase())
 }
 
 /// Read a specific line range from a file without loading it entirely.
@@ -276,6 +306,17 @@ mod tests {
         assert_eq!(encoding, "utf-8-sig");
     }
 
+    #[test]
+    fn test_detect_utf8_split_at_sample_boundary() {
+        let mut file = NamedTempFile::new().unwrap();
+        file.write_all("ab🚀".as_bytes()).unwrap();
+        file.flush().unwrap();
+
+        // A 4-byte sample ends two bytes into the emoji
+        let encoding = detect_encoding(file.path(), 4);
+        assert_eq!(encoding, "utf-8");
+    }
+
     #[test]
     fn test_is_binary_null_byte() {
         let mut file = NamedTempFile::new().unwrap();
@@ -294,6 +335,15 @@ mod tests {
         assert!(!is_binary_file(file.path(), DEFAULT_SAMPLE_SIZE));
     }
 
+    #[test]
+    fn test_is_binary_mostly_non_printable() {
+        let mut file = NamedTempFile::new().unwrap();
+        file.write_all(&[0x01, 0x02, 0x03, 0x7f, 0x80, 0xfe, b'a', b'b']).unwrap();
+        file.flush().unwrap();
+
+        assert!(is_binary_file(file.path(), DEFAULT_SAMPLE_SIZE));
+    }
+
     #[test]
     fn test_read_file_safe_utf8() {
         let mut file = NamedTempFile::new().unwrap();
@@ -315,6 +365,18 @@ mod tests {
         assert_eq!(content.chars().count(), 5);
     }
 
+    #[test]
+    fn test_read_file_safe_bounded_read_keeps_utf8() {
+        let mut file = NamedTempFile::new().unwrap();
+        file.write_all("€".repeat(DEFAULT_SAMPLE_SIZE).as_bytes()).unwrap();
+        file.flush().unwrap();
+
+        // The 12004-byte read bound splits a 3-byte character; the content stays strict UTF-8
+        let (content, encoding) = read_file_safe(file.path(), Some(3001), None).unwrap();
+        assert_eq!(encoding, "utf-8");
+        assert_eq!(content, "€".repeat(3001));
+    }
+
     #[test]
     fn test_stream_file_lines() {
         let mut file = NamedTempFile::new().unwrap();
@@ -1,14 +1,39 @@
 //! Stable hashing for chunk IDs
 
 use sha2::{Digest, Sha256};
+use std::fmt::Write as _;
 
 pub fn stable_hash(content: &str, path: &str, start_line: usize, end_line: usize) -> String {
     // Match Python: hashlib.sha256(f"{path}:{start_line}-{end_line}:{content[:1000]}".encode()).hexdigest()[:16]
     // content[:1000] in Python slices by character, so use char-boundary-safe truncation.
-    let content_prefix: String = content.chars().take(1000).collect();
-    let hash_input = format!("{path}:{start_line}-{end_line}:{content_prefix}");
+    // The fields are fed to the hasher in turn, so the content prefix is never copied.
+    let prefix_end = content.char_indices().nth(1000).map_or(content.len(), |(end, _)| end);
     let mut hasher = Sha256::new();
-    hasher.update(hash_input.as_bytes());
-    let result = hasher.finalize();
-    format!("{:x}", result)[..16].to_string()
+    hasher.update(format!("{path}:{start_line}-{end_line}:").as_bytes());
+    hasher.update(&content.as_bytes()[..prefix_end]);
+    hex_prefix(&hasher.finalize()[..8])
+}
+
+/// Lowercase hex of `bytes`: for a digest's first 8 bytes, the same 16 characters as
+/// formatting the whole digest and slicing it.
+pub fn hex_prefix(bytes: &[u8]) -> String {
+    let mut hex = String::with_capacity(bytes.len() * 2);
+    for byte in bytes {
+        let _ = write!(hex, "{byte:02x}");
+    }
+    hex
+}
+
+#[cfg(test)]
+mod tests {
+    use super::stable_hash;
+
+    #[test]
+    fn stable_hash_matches_python_digest_prefix() {
+        assert_eq!(stable_hash("hello", "a.py", 1, 2), "259baae02f4bd4c8");
+        // Only the first 1000 characters count, even when they are multi-byte.
+        let long = "é".repeat(1500);
+        assert_eq!(stable_hash(&long, "b.rs", 3, 40), "69d98bf6e374da9e");
+        assert_eq!(stable_hash(&long[..2000], "b.rs", 3, 40), "69d98bf6e374da9e");
+    }
 }
@@ -1,6 +1,29 @@
 //! Path normalization
 
+use std::borrow::Cow;
+
 pub fn normalize_path(path: &str) -> String {
+    normalize_path_cow(path).into_owned()
+}
+
+/// Normalize a path, borrowing it unchanged when it has no backslashes.
+pub fn normalize_path_cow(path: &str) -> Cow<'_, str> {
     // Convert backslashes to forward slashes and normalize
-    path.replace('\\', "/")
+    if path.contains('\\') {
+        Cow::Owned(path.replace('\\', "/"))
+    } else {
+        Cow::Borrowed(path)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn normalize_path_borrows_forward_slash_paths() {
+        assert!(matches!(normalize_path_cow("src/main.rs"), Cow::Borrowed("src/main.rs")));
+        assert_eq!(normalize_path_cow("src\\utils\\mod.rs"), "src/utils/mod.rs");
+        assert_eq!(normalize_path("a\\b/c"), "a/b/c");
+    }
 }
@@ -5,6 +5,7 @@ use predicates::prelude::*;
 use rusqlite::{Connection, OptionalExtension};
 use serde_json::Value;
 use std::fs;
+use std::path::PathBuf;
 use std::process::Command as StdCommand;
 use tempfile::TempDir;
 
@@ -84,60 +85,56 @@ fn test_export_accepts_contribution_mode() {
 
 #[test]
 fn test_export_quick_flag_skips_guided_mode() {
-    let repo = TempDir::new().expect("temp repo dir");
-    fs::write(repo.path().join("main.rs"), "fn main() {}\n").expect("write source file");
-    let out = TempDir::new().expect("temp out dir");
+    let (_temp, repo, out) = scratch_dirs();
+    fs::write(repo.join("main.rs"), "fn main() {}\n").expect("write source file");
 
     let mut cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
     cmd.args([
         "export",
         "--path",
-        repo.path().to_str().expect("utf8 repo path"),
+        repo.to_str().expect("utf8 repo path"),
         "--quick",
         "--no-timestamp",
         "--output-dir",
-        out.path().to_str().expect("utf8 out path"),
+        out.to_str().expect("utf8 out path"),
     ]);
     cmd.assert().success();
 }
 
 #[test]
 fn test_export_auto_falls_back_to_quick_in_non_interactive_sessions() {
-    let repo = TempDir::new().expect("temp repo dir");
-    fs::write(repo.path().join("main.rs"), "fn main() {}\n").expect("write source file");
-    let out = TempDir::new().expect("temp out dir");
+    let (_temp, repo, out) = scratch_dirs();
+    fs::write(repo.join("main.rs"), "fn main() {}\n").expect("write source file");
 
     let mut cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
     cmd.args([
         "export",
         "--path",
-        repo.path().to_str().expect("utf8 repo path"),
+        repo.to_str().expect("utf8 repo path"),
         "--no-timestamp",
         "--output-dir",
-        out.path().to_str().expect("utf8 out path"),
+        out.to_str().expect("utf8 out path"),
     ]);
     cmd.assert().success().stderr(predicate::str::contains("non-interactive session detected"));
 }
 
 #[test]
 fn test_export_strict_budget_fails_when_protected_pins_exceed_budget() {
-    let repo = TempDir::new().expect("temp repo dir");
-    fs::write(repo.path().join("README.md"), "# Repo\n").expect("write readme");
-    fs::write(repo.path().join("CONTRIBUTING.md"), "# Contributing\nMust do this\n")
+    let (_temp, repo, out) = scratch_dirs();
+    fs::write(repo.join("README.md"), "# Repo\n").expect("write readme");
+    fs::write(repo.join("CONTRIBUTING.md"), "# Contributing\nMust do this\n")
         .expect("write contributing");
-    fs::write(repo.path().join("SECURITY.md"), "# Security\nMust do that\n")
-        .expect("write security");
-    fs::write(repo.path().join("Cargo.toml"), "[package]\nname='demo'\nversion='0.1.0'\n")
+    fs::write(repo.join("SECURITY.md"), "# Security\nMust do that\n").expect("write security");
+    fs::write(repo.join("Cargo.toml"), "[package]\nname='demo'\nversion='0.1.0'\n")
         .expect("write cargo");
-    fs::create_dir_all(repo.path().join("src")).expect("mkdir src");
-    fs::write(repo.path().join("src/lib.rs"), "pub fn x() {}\n").expect("write source");
-    let out = TempDir::new().expect("temp out dir");
+    fs::create_dir_all(repo.join("src")).expect("mkdir src");
+    fs::write(repo.join("src/lib.rs"), "pub fn x() {}\n").expect("write source");
 
     let mut cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
     cmd.args([
         "export",
         "--path",
-        repo.path().to_str().expect("utf8 repo path"),
+        repo.to_str().expect("utf8 repo path"),
         "--mode",
         "contribution",
         "--max-tokens",
@@ -146,21 +143,21 @@ fn test_export_strict_budget_fails_when_protected_pins_exceed_budget() {
         "--quick",
         "--no-timestamp",
         "--output-dir",
-        out.path().to_str().expect("utf8 out path"),
+        out.to_str().expect("utf8 out path"),
     ]);
     cmd.assert().failure().stderr(predicate::str::contains("protected pin files require"));
 }
 
 #[test]
 fn test_export_from_index_uses_fresh_index_metadata() {
-    let repo = TempDir::new().expect("temp repo dir");
-    fs::create_dir_all(repo.path().join("src")).expect("mkdir src");
-    fs::write(repo.path().join("Cargo.toml"), "[package]\nname='demo'\nversion='0.1.0'\n")
+    let (_temp, repo, out) = scratch_dirs();
+    fs::create_dir_all(repo.join("src")).expect("mkdir src");
+    fs::write(repo.join("Cargo.toml"), "[package]\nname='demo'\nversion='0.1.0'\n")
         .expect("write cargo");
-    fs::write(repo.path().join("src/lib.rs"), "pub fn hello() -> &'static str { \"hi\" }\n")
+    fs::write(repo.join("src/lib.rs"), "pub fn hello() -> &'static str { \"hi\" }\n")
         .expect("write lib");
 
-    let index_dir = repo.path().join(".repo-context");
+    let index_dir = repo.join(".repo-context");
     fs::create_dir_all(&index_dir).expect("mkdir index dir");
     let db_path = index_dir.join("index.sqlite");
 
@@ -168,30 +165,29 @@ fn test_export_from_index_uses_fresh_index_metadata() {
     index_cmd.args([
         "index",
         "--path",
-        repo.path().to_str().expect("repo path"),
+        repo.to_str().expect("repo path"),
         "--db",
         db_path.to_str().expect("db path"),
     ]);
     index_cmd.assert().success();
 
-    let out = TempDir::new().expect("out dir");
     let mut export_cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
     export_cmd.args([
         "export",
         "--path",
-        repo.path().to_str().expect("repo path"),
+        repo.to_str().expect("repo path"),
         "--from-index",
         "--quick",
         "--no-timestamp",
         "--output-dir",
-        out.path().to_str().expect("out path"),
+        out.to_str().expect("out path"),
     ]);
     export_cmd.assert().success().stdout(predicate::str::contains("using index dataset"));
 
-    let repo_name = repo.path().file_name().and_then(|n| n.to_str()).unwrap_or("repo");
-    let report_path = out.path().join(repo_name).join(format!("{repo_name}_report.json"));
-    let report_raw = fs::read_to_string(report_path).expect("read report");
-    let report: Value = serde_json::from_str(&report_raw).expect("parse report");
+    let repo_name = repo.file_name().and_then(|n| n.to_str()).unwrap_or("repo");
+    let report_path = out.join(repo_name).join(format!("{repo_name}_report.json"));
+    let report_raw = fs::read(report_path).expect("read report");
+    let report: Value = serde_json::from_slice(&report_raw).expect("parse report");
     assert_eq!(report["provenance"]["index"]["used_for_export"], Value::Bool(true));
 }
 
@@ -356,8 +352,8 @@ fn test_index_creates_sqlite_database_with_symbols() {
         .success()
         .stdout(predicate::str::contains("Code-intel export written to"));
 
-    let exported = fs::read_to_string(&out_path).expect("read codeintel output");
-    let doc: serde_json::Value = serde_json::from_str(&exported).expect("parse codeintel json");
+    let exported = fs::read(&out_path).expect("read codeintel output");
+    let doc: serde_json::Value = serde_json::from_slice(&exported).expect("parse codeintel json");
     assert_eq!(doc.get("format").and_then(|v| v.as_str()), Some("scip-lite"));
     assert_eq!(doc.get("schema_version").and_then(|v| v.as_str()), Some("0.4.0"));
     assert!(doc
@@ -457,6 +453,16 @@ fn test_index_lsp_creates_symbol_edges_when_available() {
     assert!(indexed_mtime_count >= 3);
 }
 
+/// One scratch dir per test holding both the input repo and the export output, so each
+/// test creates and removes a single temporary tree.
+fn scratch_dirs() -> (TempDir, PathBuf, PathBuf) {
+    let temp = TempDir::new().expect("temp dir");
+    let repo = temp.path().join("repo");
+    let out = temp.path().join("out");
+    fs::create_dir_all(&repo).expect("mkdir repo");
+    (temp, repo, out)
+}
+
 fn rust_analyzer_available() -> bool {
     StdCommand::new("rust-analyzer")
         .arg("--version")
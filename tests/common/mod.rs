@@ -0,0 +1,67 @@
+//! Fixture helpers shared by the integration test binaries.
+
+#![allow(dead_code)]
+
+use std::fs;
+use std::path::{Path, PathBuf};
+use std::sync::{Arc, Mutex, PoisonError, Weak};
+use tempfile::TempDir;
+
+/// A fixture repo written into its own temporary directory, removed when dropped.
+///
+/// The tree lives under the system temp dir rather than Cargo's target dir: exports resolve
+/// the repository root by walking up to the nearest `.git`, which inside this crate's
+/// checkout would be the crate itself. The repo sits in a subdirectory called `name`, so
+/// the exported repo name is the same on every run.
+pub struct FixtureRepo {
+    _dir: TempDir,
+    root: PathBuf,
+}
+
+impl FixtureRepo {
+    /// Write `files` (paths relative to the repo root) into a fresh temporary repo.
+    pub fn new(name: &str, files: &[(&str, &str)]) -> Self {
+        let dir = TempDir::new().expect("temp fixture dir");
+        let root = dir.path().join(name);
+        for (rel, contents) in files {
+            let path = root.join(rel);
+            if let Some(parent) = path.parent() {
+                fs::create_dir_all(parent).expect("mkdir fixture dir");
+            }
+            fs::write(&path, contents).expect("write fixture file");
+        }
+        FixtureRepo { _dir: dir, root }
+    }
+
+    pub fn root(&self) -> &Path {
+        &self.root
+    }
+}
+
+/// A fixture shared by the tests that hold it at the same time.
+///
+/// Statics are never dropped, so a fixture stored in a `Lazy` would leave its temporary
+/// directory behind. Tests hold an `Arc` instead: the fixture is built on first use,
+/// removed when its last holder finishes, and built again if a later test asks for it.
+pub struct SharedFixture<T> {
+    slot: Mutex<Weak<T>>,
+}
+
+impl<T> Default for SharedFixture<T> {
+    fn default() -> Self {
+        SharedFixture { slot: Mutex::new(Weak::new()) }
+    }
+}
+
+impl<T> SharedFixture<T> {
+    /// Return the live fixture, or build it with `init` if no test currently holds one.
+    pub fn get_or_init(&self, init: impl FnOnce() -> T) -> Arc<T> {
+        let mut slot = self.slot.lock().unwrap_or_else(PoisonError::into_inner);
+        if let Some(fixture) = slot.upgrade() {
+            return fixture;
+        }
+        let fixture = Arc::new(init());
+        *slot = Arc::downgrade(&fixture);
+        fixture
+    }
+}
@@ -1,49 +1,53 @@
 //! Integration tests for export outputs and determinism.
 
+mod common;
+
 use assert_cmd::Command;
+use common::{FixtureRepo, SharedFixture};
+use once_cell::sync::Lazy;
 use std::fs;
-use std::path::Path;
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
 use tempfile::TempDir;
 
 #[test]
 fn export_is_deterministic_without_timestamp() {
-    let fixture = TestRepo::new();
+    // One fresh run with the shared run's exact arguments: two pipeline invocations in total.
+    let shared = shared_export();
+    let fixture = &shared.repo;
     let out_base = TempDir::new().expect("temp out");
-    let out1 = out_base.path().join("out1");
-    let out2 = out_base.path().join("out2");
-
-    run_export(fixture.root(), &out1);
-    run_export(fixture.root(), &out2);
-
-    let actual1 = resolve_output_dir(&out1, fixture.root());
-    let actual2 = resolve_output_dir(&out2, fixture.root());
-
-    let context1 =
-        fs::read_to_string(actual1.join(output_file_name(fixture.root(), "context_pack.md")))
-            .expect("read context 1");
-    let context2 =
-        fs::read_to_string(actual2.join(output_file_name(fixture.root(), "context_pack.md")))
-            .expect("read context 2");
-    assert_eq!(context1, context2);
-
-    let chunks1 =
-        fs::read_to_string(actual1.join(output_file_name(fixture.root(), "chunks.jsonl")))
-            .expect("read chunks 1");
-    let chunks2 =
-        fs::read_to_string(actual2.join(output_file_name(fixture.root(), "chunks.jsonl")))
-            .expect("read chunks 2");
-    assert_eq!(chunks1, chunks2);
+    let out = out_base.path().join("out");
+
+    run_export(fixture.root(), &out, &[]);
+
+    let fresh = resolve_output_dir(&out, fixture.root());
+
+    for base_name in ["context_pack.md", "chunks.jsonl"] {
+        let file_name = output_file_name(fixture.root(), base_name);
+        let expected = fs::read(shared.dir.join(&file_name)).expect("read shared output");
+        let actual = fs::read(fresh.join(&file_name)).expect("read fresh output");
+        assert_eq!(expected, actual, "{base_name} differs between runs");
+    }
+
+    let file_name = output_file_name(fixture.root(), "report.json");
+    let expected = fs::read_to_string(shared.dir.join(&file_name)).expect("read shared report");
+    let actual = fs::read_to_string(fresh.join(&file_name)).expect("read fresh report");
+    assert_eq!(stable_report(&expected, &shared.base), stable_report(&actual, &out));
+}
+
+/// Report with its output location and wall-clock timing masked, the only parts that
+/// differ between two runs with the same arguments.
+fn stable_report(raw: &str, output_base: &Path) -> serde_json::Value {
+    let raw = raw.replace(output_base.to_str().expect("out str"), "<OUTPUT_DIR>");
+    let mut report: serde_json::Value = serde_json::from_str(&raw).expect("parse report");
+    report["stats"]["processing_time_seconds"] = serde_json::Value::Null;
+    report
 }
 
 #[test]
 fn export_applies_redaction_and_report_shape() {
-    let fixture = TestRepo::new();
-    let out_base = TempDir::new().expect("temp out");
-    let out = out_base.path().join("out");
-
-    run_export(fixture.root(), &out);
-
-    let actual = resolve_output_dir(&out, fixture.root());
+    let shared = shared_export();
+    let (fixture, actual) = (&shared.repo, &shared.dir);
 
     let chunks = fs::read_to_string(actual.join(output_file_name(fixture.root(), "chunks.jsonl")))
         .expect("read chunks");
@@ -54,10 +58,9 @@ fn export_applies_redaction_and_report_shape() {
             || chunks.contains("[HIGH_ENTROPY_REDACTED]")
     );
 
-    let report_raw =
-        fs::read_to_string(actual.join(output_file_name(fixture.root(), "report.json")))
-            .expect("read report");
-    let report: serde_json::Value = serde_json::from_str(&report_raw).expect("parse report");
+    let report_raw = fs::read(actual.join(output_file_name(fixture.root(), "report.json")))
+        .expect("read report");
+    let report: serde_json::Value = serde_json::from_slice(&report_raw).expect("parse report");
     assert_eq!(report["schema_version"], serde_json::json!("1.0.0"));
     assert!(report.get("generated_at").is_none());
     assert!(report.get("config").is_some());
@@ -77,8 +80,10 @@ fn export_applies_redaction_and_report_shape() {
 
 #[test]
 fn contribution_mode_uses_pinned_only_fallback_under_tiny_budget() {
+    // Repo and output share one scratch dir: a single temporary tree per test
     let temp = TempDir::new().expect("temp dir");
-    let root = temp.path();
+    let root = &temp.path().join("repo");
+    fs::create_dir_all(root).expect("mkdir repo");
     fs::create_dir_all(root.join("src")).expect("mkdir src");
     fs::write(root.join("README.md"), "# Repo\n\nOverview\n").expect("write readme");
     fs::write(root.join("CONTRIBUTING.md"), "# Contributing\n\nMust follow style.\n")
@@ -93,8 +98,7 @@ fn contribution_mode_uses_pinned_only_fallback_under_tiny_budget() {
     )
     .expect("write lib");
 
-    let out_base = TempDir::new().expect("temp out");
-    let out = out_base.path().join("out");
+    let out = temp.path().join("out");
     let mut cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
     cmd.args([
         "export",
@@ -112,9 +116,9 @@ fn contribution_mode_uses_pinned_only_fallback_under_tiny_budget() {
     cmd.assert().success();
 
     let actual = resolve_output_dir(&out, root);
-    let report_raw = fs::read_to_string(actual.join(output_file_name(root, "report.json")))
-        .expect("read report");
-    let report: serde_json::Value = serde_json::from_str(&report_raw).expect("parse report");
+    let report_raw =
+        fs::read(actual.join(output_file_name(root, "report.json"))).expect("read report");
+    let report: serde_json::Value = serde_json::from_slice(&report_raw).expect("parse report");
     assert_eq!(report["stats"]["pinned_only_mode"], serde_json::json!(true));
     assert!(report["stats"]["pinned_overflow_tokens"].as_u64().unwrap_or(0) > 0);
 
@@ -130,17 +134,11 @@ fn contribution_mode_uses_pinned_only_fallback_under_tiny_budget() {
 fn report_processing_time_is_nonzero() {
     // H1 regression test: processing_time_seconds must be recorded BEFORE write_report is
     // called, so the value in report.json is > 0 (not the default 0.0).
-    let fixture = TestRepo::new();
-    let out_base = TempDir::new().expect("temp out");
-    let out = out_base.path().join("out");
-
-    run_export(fixture.root(), &out);
-
-    let actual = resolve_output_dir(&out, fixture.root());
-    let report_raw =
-        fs::read_to_string(actual.join(output_file_name(fixture.root(), "report.json")))
-            .expect("read report");
-    let report: serde_json::Value = serde_json::from_str(&report_raw).expect("parse report");
+    let shared = shared_export();
+    let (fixture, actual) = (&shared.repo, &shared.dir);
+    let report_raw = fs::read(actual.join(output_file_name(fixture.root(), "report.json")))
+        .expect("read report");
+    let report: serde_json::Value = serde_json::from_slice(&report_raw).expect("parse report");
 
     let processing_time = report["stats"]["processing_time_seconds"]
         .as_f64()
@@ -153,7 +151,7 @@ fn report_processing_time_is_nonzero() {
 
 #[test]
 fn export_task_reranking_is_recorded_in_report() {
-    let fixture = TestRepo::new();
+    let fixture = shared_repo();
     let out_base = TempDir::new().expect("temp out");
     let out = out_base.path().join("out");
 
@@ -173,17 +171,16 @@ fn export_task_reranking_is_recorded_in_report() {
     cmd.assert().success();
 
     let actual = resolve_output_dir(&out, fixture.root());
-    let report_raw =
-        fs::read_to_string(actual.join(output_file_name(fixture.root(), "report.json")))
-            .expect("read report");
-    let report: serde_json::Value = serde_json::from_str(&report_raw).expect("parse report");
+    let report_raw = fs::read(actual.join(output_file_name(fixture.root(), "report.json")))
+        .expect("read report");
+    let report: serde_json::Value = serde_json::from_slice(&report_raw).expect("parse report");
 
     assert_eq!(report["config"]["task_query"], serde_json::json!("guide documentation"));
     let mode = report["config"]["reranking"].as_str().unwrap_or_default();
     assert!(mode.starts_with("bm25+"), "unexpected reranking mode: {mode}");
 }
 
-fn run_export(repo_root: &Path, output_dir: &Path) {
+fn run_export(repo_root: &Path, output_dir: &Path, extra_args: &[&str]) {
     let mut cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
     cmd.args([
         "export",
@@ -201,9 +198,36 @@ fn run_export(repo_root: &Path, output_dir: &Path) {
         "--min-chunk-tokens",
         "80",
     ]);
+    cmd.args(extra_args);
     cmd.assert().success();
 }
 
+/// Default `run_export` of the shared fixture, with the output directory it wrote.
+///
+/// Tests that only read the default export's files share this run instead of exporting
+/// the same tree again. The output lives in its own `TempDir`, so every run starts from an
+/// empty directory and nothing is left behind once the last holder drops it.
+struct SharedExport {
+    repo: Arc<FixtureRepo>,
+    /// `--output-dir` passed to the export
+    base: PathBuf,
+    /// Directory the export actually wrote, `base` plus the repo name
+    dir: PathBuf,
+    _out: TempDir,
+}
+
+fn shared_export() -> Arc<SharedExport> {
+    static EXPORT: Lazy<SharedFixture<SharedExport>> = Lazy::new(SharedFixture::default);
+    EXPORT.get_or_init(|| {
+        let repo = shared_repo();
+        let out = TempDir::new().expect("temp out");
+        let base = out.path().join("out");
+        run_export(repo.root(), &base, &[]);
+        let dir = resolve_output_dir(&base, repo.root());
+        SharedExport { repo, base, dir, _out: out }
+    })
+}
+
 /// Resolve the actual output directory used by the CLI for this repo root and base output dir.
 /// Matches `resolve_output_dir` in src/cli/export.rs: appends repo name unless it already matches.
 fn resolve_output_dir(output_dir: &Path, repo_root: &Path) -> std::path::PathBuf {
@@ -220,33 +244,24 @@ fn output_file_name(repo_root: &Path, base_name: &str) -> String {
     format!("{repo_name}_{base_name}")
 }
 
-struct TestRepo {
-    temp: TempDir,
-}
-
-impl TestRepo {
-    fn new() -> Self {
-        let temp = TempDir::new().expect("temp dir");
-        let root = temp.path();
-        fs::create_dir_all(root.join("src")).expect("mkdir src");
-        fs::create_dir_all(root.join("docs")).expect("mkdir docs");
-
-        fs::write(root.join("README.md"), "# Demo\n\nSmall fixture repo.\n").expect("write readme");
-        fs::write(
-            root.join("src/main.py"),
-            "def main():\n    token = \"sk-abcdefghijklmnopqrstuvwxyz12345\"\n    return token\n",
-        )
-        .expect("write main.py");
-        fs::write(root.join("docs/guide.md"), "# Guide\n\nHello\n").expect("write guide");
-        fs::write(root.join("pyproject.toml"), "[project]\nname='demo'\n")
-            .expect("write pyproject");
-
-        Self { temp }
-    }
-
-    fn root(&self) -> &Path {
-        self.temp.path()
-    }
+/// Files of the shared fixture repo, relative to its root.
+const FIXTURE_FILES: &[(&str, &str)] = &[
+    ("README.md", "# Demo\n\nSmall fixture repo.\n"),
+    (
+        "src/main.py",
+        "def main():\n    token = \"sk-abcdefghijklmnopqrstuvwxyz12345\"\n    return token\n",
+    ),
+    ("docs/guide.md", "# Guide\n\nHello\n"),
+    ("pyproject.toml", "[project]\nname='demo'\n"),
+];
+
+/// Read-only fixture repo shared by the tests running at the same time.
+///
+/// Exports only write into their own output directories, so concurrent tests reuse one
+/// tree instead of building it per test.
+fn shared_repo() -> Arc<FixtureRepo> {
+    static REPO: Lazy<SharedFixture<FixtureRepo>> = Lazy::new(SharedFixture::default);
+    REPO.get_or_init(|| FixtureRepo::new("export_output_fixture", FIXTURE_FILES))
 }
 
 #[test]
@@ -254,8 +269,10 @@ fn byte_budget_breaks_on_limit_and_drops_all_remaining() {
     // Regression test: Python's byte-budget semantics use `break` not `continue`.
     // When cumulative accepted bytes >= limit, the current file AND all subsequent
     // files are bulk-dropped with reason "bytes_limit".
+    // Repo and output share one scratch dir: a single temporary tree per test
     let temp = TempDir::new().expect("temp dir");
-    let root = temp.path();
+    let root = &temp.path().join("repo");
+    fs::create_dir_all(root).expect("mkdir repo");
     fs::create_dir_all(root.join("src")).expect("mkdir src");
 
     // small.py (~6 bytes) — fits in budget
@@ -266,8 +283,7 @@ fn byte_budget_breaks_on_limit_and_drops_all_remaining() {
     // small2.py (~6 bytes) — comes after large.py; Python breaks so this is also dropped
     fs::write(root.join("src/small2.py"), "y = 2\n").expect("write small2.py");
 
-    let out_base = TempDir::new().expect("temp out");
-    let out = out_base.path().join("out");
+    let out = temp.path().join("out");
 
     // Budget of 150 bytes: small.py (6B) fits, then cumulative=6, large.py (195B) causes
     // total+size > limit; Python checks total >= limit before adding so small.py is accepted
@@ -294,9 +310,9 @@ fn byte_budget_breaks_on_limit_and_drops_all_remaining() {
     cmd.assert().success();
 
     let actual = resolve_output_dir(&out, root);
-    let report_raw = fs::read_to_string(actual.join(output_file_name(root, "report.json")))
-        .expect("read report");
-    let report: serde_json::Value = serde_json::from_str(&report_raw).expect("parse report");
+    let report_raw =
+        fs::read(actual.join(output_file_name(root, "report.json"))).expect("read report");
+    let report: serde_json::Value = serde_json::from_slice(&report_raw).expect("parse report");
 
     // At least large.py and small2.py should be dropped
     let dropped = report["stats"]["files_dropped_budget"].as_u64().unwrap_or(0);
@@ -1,69 +1,105 @@
 //! Golden snapshot tests for export outputs.
 
+mod common;
+
 use assert_cmd::Command;
+use common::FixtureRepo;
 use insta::{assert_json_snapshot, assert_snapshot};
+use once_cell::sync::Lazy;
 use serde_json::Value;
 use std::fs;
 use std::path::Path;
 use tempfile::TempDir;
 
 #[test]
-fn golden_export_outputs_are_stable() {
-    let fixture = GoldenRepo::new();
-    let out = TempDir::new().expect("temp out");
-    let output_dir = out.path().join("export");
-
-    let mut cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
-    cmd.args([
-        "export",
-        "--path",
-        fixture.root().to_str().expect("fixture path"),
-        "--mode",
-        "both",
-        "--output-dir",
-        output_dir.to_str().expect("output path"),
-        "--no-timestamp",
-        "--chunk-tokens",
-        "220",
-        "--chunk-overlap",
-        "30",
-        "--min-chunk-tokens",
-        "80",
-        "--max-tokens",
-        "2000",
-    ]);
-    cmd.assert().success();
-
-    // The CLI namespaces output by repo name (matches Python get_repo_output_dir).
-    let repo_name = fixture.root().file_name().and_then(|n| n.to_str()).unwrap_or("repo");
-    let actual_output_dir = if output_dir.file_name().and_then(|n| n.to_str()) == Some(repo_name) {
-        output_dir.clone()
-    } else {
-        output_dir.join(repo_name)
-    };
-
-    let context = fs::read_to_string(
-        actual_output_dir.join(output_file_name(fixture.root(), "context_pack.md")),
-    )
-    .expect("context pack");
-    let chunks = fs::read_to_string(
-        actual_output_dir.join(output_file_name(fixture.root(), "chunks.jsonl")),
-    )
-    .expect("chunks");
-    let report_raw =
-        fs::read_to_string(actual_output_dir.join(output_file_name(fixture.root(), "report.json")))
-            .expect("report");
-    let report_json: Value = serde_json::from_str(&report_raw).expect("report json");
-
-    let normalized_context = normalize_context(&context, fixture.root());
-    let normalized_chunks = normalize_chunks(&chunks, fixture.root());
-    let normalized_report = normalize_report(report_json, fixture.root());
-
+fn golden_context_pack_is_stable() {
+    let normalized_context = &GoldenOutputs::shared().context;
     assert_snapshot!("golden_context_pack", normalized_context);
+}
+
+#[test]
+fn golden_chunks_jsonl_is_stable() {
+    let normalized_chunks = &GoldenOutputs::shared().chunks;
     assert_snapshot!("golden_chunks_jsonl", normalized_chunks);
+}
+
+#[test]
+fn golden_report_json_is_stable() {
+    let normalized_report = &GoldenOutputs::shared().report;
     assert_json_snapshot!("golden_report_json", normalized_report);
 }
 
+/// Normalized outputs of one golden export, shared by the snapshot tests above.
+///
+/// The export runs once per test binary; each test only compares its own artifact, so a
+/// drift in one output no longer hides the state of the other two. Only the normalized
+/// text is kept: the fixture repo and the export's output are removed once it is read.
+struct GoldenOutputs {
+    context: String,
+    chunks: String,
+    report: Value,
+}
+
+impl GoldenOutputs {
+    fn shared() -> &'static Self {
+        static SHARED: Lazy<GoldenOutputs> = Lazy::new(|| {
+            let fixture = FixtureRepo::new("golden_fixture", FIXTURE_FILES);
+            let out = TempDir::new().expect("temp out");
+            let output_dir = out.path().join("export");
+
+            let mut cmd = Command::new(assert_cmd::cargo::cargo_bin!("repo-context"));
+            cmd.args([
+                "export",
+                "--path",
+                fixture.root().to_str().expect("fixture path"),
+                "--mode",
+                "both",
+                "--output-dir",
+                output_dir.to_str().expect("output path"),
+                "--no-timestamp",
+                "--chunk-tokens",
+                "220",
+                "--chunk-overlap",
+                "30",
+                "--min-chunk-tokens",
+                "80",
+                "--max-tokens",
+                "2000",
+            ]);
+            cmd.assert().success();
+
+            // The CLI namespaces output by repo name (matches Python get_repo_output_dir).
+            let repo_name = fixture.root().file_name().and_then(|n| n.to_str()).unwrap_or("repo");
+            let actual_output_dir =
+                if output_dir.file_name().and_then(|n| n.to_str()) == Some(repo_name) {
+                    output_dir.clone()
+                } else {
+                    output_dir.join(repo_name)
+                };
+
+            let context = fs::read_to_string(
+                actual_output_dir.join(output_file_name(fixture.root(), "context_pack.md")),
+            )
+            .expect("context pack");
+            let chunks = fs::read_to_string(
+                actual_output_dir.join(output_file_name(fixture.root(), "chunks.jsonl")),
+            )
+            .expect("chunks");
+            let report_raw =
+                fs::read(actual_output_dir.join(output_file_name(fixture.root(), "report.json")))
+                    .expect("report");
+            let report_json: Value = serde_json::from_slice(&report_raw).expect("report json");
+
+            GoldenOutputs {
+                context: normalize_context(&context, fixture.root()),
+                chunks: normalize_chunks(&chunks, fixture.root()),
+                report: normalize_report(report_json, fixture.root()),
+            }
+        });
+        &SHARED
+    }
+}
+
 fn normalize_context(input: &str, fixture_root: &Path) -> String {
     let mut normalized =
         input.replace(fixture_root.to_str().expect("fixture root str"), "/<FIXTURE_ROOT>");
@@ -152,49 +188,20 @@ fn normalize_output_file_name(file_name: &str, fixture_root: &Path) -> String {
     file_name.to_string()
 }
 
-struct GoldenRepo {
-    temp: TempDir,
-}
-
-impl GoldenRepo {
-    fn new() -> Self {
-        let temp = TempDir::new().expect("temp dir");
-        let root = temp.path();
-
-        fs::create_dir_all(root.join("src")).expect("mkdir src");
-        fs::create_dir_all(root.join("docs")).expect("mkdir docs");
-
-        fs::write(
-            root.join("README.md"),
-            "# Golden Fixture\n\nThis is a stable fixture repository for snapshot tests.\n",
-        )
-        .expect("write readme");
-
-        fs::write(
-            root.join("src/main.py"),
-            "def greet(name: str) -> str:\n    token = \"sk-abcdefghijklmnopqrstuvwxyz12345\"\n    return f\"Hello {name}\"\n\n\ndef main() -> None:\n    print(greet(\"world\"))\n",
-        )
-        .expect("write main.py");
-
-        fs::write(
-            root.join("src/helpers.py"),
-            "class Helper:\n    def run(self) -> None:\n        pass\n",
-        )
-        .expect("write helpers.py");
-
-        fs::write(root.join("docs/guide.md"), "# Guide\n\nUse `python -m app`.\n")
-            .expect("write guide");
-
-        fs::write(
-            root.join("pyproject.toml"),
-            "[project]\nname='golden-fixture'\n\n[project.scripts]\nfixture='src.main:main'\n",
-        )
-        .expect("write pyproject");
-
-        Self { temp }
-    }
-
-    fn root(&self) -> &Path {
-        self.temp.path()
-    }
-}
+/// Files of the golden fixture repo, relative to its root.
+const FIXTURE_FILES: &[(&str, &str)] = &[
+    (
+        "README.md",
+        "# Golden Fixture\n\nThis is a stable fixture repository for snapshot tests.\n",
+    ),
+    (
+        "src/main.py",
+        "def greet(name: str) -> str:\n    token = \"sk-abcdefghijklmnopqrstuvwxyz12345\"\n    return f\"Hello {name}\"\n\n\ndef main() -> None:\n    print(greet(\"world\"))\n",
+    ),
+    ("src/helpers.py", "class Helper:\n    def run(self) -> None:\n        pass\n"),
+    ("docs/guide.md", "# Guide\n\nUse `python -m app`.\n"),
+    (
+        "pyproject.toml",
+        "[project]\nname='golden-fixture'\n\n[project.scripts]\nfixture='src.main:main'\n",
+    ),
+];